@@ -5,6 +5,7 @@ from app.database import get_db
 from app.models import Admin
 from app.schemas.admin import AdminCreate, AdminLogin, TokenResponse
 from app.utils import verify_password, create_access_token
+from app.query_budgets import query_budget
 from datetime import datetime, timedelta
 
 
@@ -17,6 +18,7 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 @router.post("/signup")
+@query_budget(statements=2, rows=5)
 def admin_signup(admin_data: AdminCreate, db: Session = Depends(get_db)):
     hashed_pw = get_password_hash(admin_data.password)
 
@@ -32,6 +34,7 @@ def admin_signup(admin_data: AdminCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
+@query_budget(statements=1, rows=5)
 def admin_login(payload: AdminLogin, db: Session = Depends(get_db)):
     admin = db.query(Admin).filter(Admin.email == payload.email).first()
     if not admin or not verify_password(payload.password, admin.hashed_password):
@@ -50,6 +53,7 @@ def admin_login(payload: AdminLogin, db: Session = Depends(get_db)):
     }
 
 @router.post("/logout")
+@query_budget(statements=0, rows=0)
 def admin_logout():
     return {"message": "Logged out successfully"}
 
@@ -1,50 +1,270 @@
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Query, Response, UploadFile
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 from typing import Optional
-import os, json, uuid
+from botocore.exceptions import ClientError
+import os, json, math, uuid
 from slugify import slugify
-from app.r2_client import r2
+from app.r2_client import r2, R2_BUCKET_NAME, public_url
 from app.database import get_db
+from app.catalog_cache import bump_catalog_version
+from app.executor import run_blocking
+from app.images import generate_product_images
+from app.r2_cleanup import drain_r2_deletions, queue_image_deletion
+from app.translations import sync_translations
+from app.utils import contains_pattern, in_fieldset, like_escape, pagination_headers, parse_fieldset
 from app.models.admin import Product, ProductTranslation, Category
+from app.schemas.adminproducts import ImageUploadComplete, ImageUploadRequest, ProductBatch, ProductTranslationPatch
+from app.query_budgets import query_budget
 
 router = APIRouter()
 
+UPLOAD_URL_EXPIRES = int(os.getenv("UPLOAD_URL_EXPIRES", "900"))  # seconds
+MAX_IMAGE_SIZE = int(os.getenv("MAX_IMAGE_SIZE", str(100 * 1024 * 1024)))
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+PRODUCT_TRANSLATION_FIELDS = ["title", "description"]
+PRODUCT_LIST_COLUMNS = ["key", "category_id", "image_url", "image_width", "image_height", "image_variants"]
+KEY_ALLOCATION_ATTEMPTS = 10
+PRODUCT_KEY_CONSTRAINTS = ("ix_products_key", "ix_products_category_key")
+
 # -------------------------
-# List all products
+# List products (keyset pagination)
 # -------------------------
+def product_list_filters(category_id: Optional[int] = None, q: Optional[str] = None) -> list:
+    filters = []
+    if category_id is not None:
+        filters.append(Product.category_id == category_id)
+    if q:
+        # Matches the key or a title in any language (trigram indexes)
+        pattern = contains_pattern(q)
+        filters.append(or_(
+            Product.key.ilike(pattern),
+            Product.id.in_(
+                select(ProductTranslation.product_id).where(ProductTranslation.title.ilike(pattern))
+            ),
+        ))
+    return filters
+
+
+def product_list_query(db: Session, lang: str, filters: list, fields=None, include=None):
+    # Join only the requested language; products without it keep an empty list
+    columns = [Product.id] + [
+        getattr(Product, field) for field in PRODUCT_LIST_COLUMNS if in_fieldset(fields, field)
+    ]
+    with_translations = in_fieldset(include, "translations")
+    if with_translations:
+        columns.append(ProductTranslation.language_code)
+        columns += [
+            getattr(ProductTranslation, field) for field in PRODUCT_TRANSLATION_FIELDS if in_fieldset(fields, field)
+        ]
+    query = db.query(*columns)
+    if with_translations:
+        query = query.outerjoin(
+            ProductTranslation,
+            and_(
+                ProductTranslation.product_id == Product.id,
+                ProductTranslation.language_code == lang,
+            ),
+        )
+    return query.filter(*filters).order_by(Product.id)
+
+
 @router.get("/by-lang/{lang}")
-def list_products(lang: str, db: Session = Depends(get_db)):
-    products = db.query(Product).options(
-        joinedload(Product.translations),
-        joinedload(Product.category)
-    ).all()
+@query_budget(statements=2, rows=15)
+def list_products(
+    lang: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    after_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    q: Optional[str] = None,
+    with_total: bool = True,
+    fields: Optional[str] = Query(None, description="Comma-separated product and translation fields; ids are always included"),
+    include: Optional[str] = Query(None, description="translations, or empty for none"),
+    db: Session = Depends(get_db),
+):
+    filters = product_list_filters(category_id, q)
+    query = product_list_query(
+        db, lang, filters,
+        parse_fieldset(fields, ["id"] + PRODUCT_LIST_COLUMNS + PRODUCT_TRANSLATION_FIELDS),
+        parse_fieldset(include, ["translations"], "include"),
+    )
+    if after_id is not None:
+        query = query.filter(Product.id > after_id)
+    if limit is not None:
+        query = query.limit(limit)
+    rows = query.all()
+
+    total = db.query(func.count(Product.id)).filter(*filters).scalar() if with_total else None
+    response.headers.update(pagination_headers([row.id for row in rows], limit, total))
 
     result = []
-    for product in products:
-        t = next((tr for tr in product.translations if tr.language_code == lang), None)
-        result.append({
-            "id": product.id,
-            "key": product.key,
-            "category_id": product.category_id,
-            "image_url": product.image_url,
-            "translations": [
+    for row in rows:
+        row = row._mapping
+        item = {field: row[field] for field in ["id"] + PRODUCT_LIST_COLUMNS if field in row}
+        if "image_variants" in item:
+            item["image_variants"] = item["image_variants"] or []
+        if "language_code" in row:
+            item["translations"] = [
                 {
-                    "language_code": t.language_code,
-                    "title": t.title,
-                    "description": t.description,
+                    "language_code": row["language_code"],
+                    **{field: row[field] for field in PRODUCT_TRANSLATION_FIELDS if field in row},
                 }
-            ] if t else []
-        })
+            ] if row["language_code"] else []
+        result.append(item)
     return result
 
 
+# -------------------------
+# Image upload
+# -------------------------
+def new_image_key(filename: str) -> str:
+    file_ext = os.path.splitext(filename)[1]
+    return f"products/{uuid.uuid4().hex}{file_ext}"
+
+
+def upload_product_image(image: UploadFile) -> str:
+    """Stream an uploaded image to R2 and return its public URL. Blocking."""
+    file_key = new_image_key(image.filename)
+    r2.put_object(
+        Bucket=R2_BUCKET_NAME,
+        Key=file_key,
+        Body=image.file,
+        ContentType=image.content_type,
+    )
+    return public_url(file_key)
+
+
+def check_image_key(image_key: str):
+    if not image_key.startswith("products/") or ".." in image_key:
+        raise HTTPException(status_code=400, detail="Invalid image_key")
+
+
+def check_uploaded_size(image_key: str, db: Optional[Session] = None):
+    """Reject an object on R2 larger than MAX_IMAGE_SIZE; the declared size is only the client's word. Blocking.
+
+    Without db the object was just assembled under a fresh key and is deleted
+    at once. With db the key came from the client and a product may already
+    use it, so it goes through the r2_deletions queue, which keeps objects in use.
+    """
+    try:
+        head = r2.head_object(Bucket=R2_BUCKET_NAME, Key=image_key)
+    except ClientError:
+        raise HTTPException(status_code=400, detail="Image has not been uploaded")
+    if head["ContentLength"] > MAX_IMAGE_SIZE:
+        if db is None:
+            r2.delete_object(Bucket=R2_BUCKET_NAME, Key=image_key)
+        else:
+            queue_image_deletion(db, [(public_url(image_key), None)])
+            db.commit()
+        raise HTTPException(status_code=413, detail="Image is too large")
+
+
+def uploaded_image_url(image_key: str, db: Session) -> str:
+    """Public URL for an image the browser already uploaded to R2. Blocking."""
+    check_image_key(image_key)
+    check_uploaded_size(image_key, db)
+    return public_url(image_key)
+
+
+@router.post("/image-uploads")
+@query_budget(statements=0, rows=0)
+def create_image_upload(payload: ImageUploadRequest):
+    """Issue presigned URLs so the browser uploads the image straight to R2."""
+    if not payload.content_type.startswith("image/"):
+        raise HTTPException(status_code=400, detail="Only images can be uploaded")
+    if payload.size > MAX_IMAGE_SIZE:
+        raise HTTPException(status_code=413, detail="Image is too large")
+
+    file_key = new_image_key(payload.filename)
+
+    if payload.size <= MULTIPART_THRESHOLD:
+        # Content-Length is signed into the URL, so R2 refuses a body of any other size
+        url = r2.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": R2_BUCKET_NAME,
+                "Key": file_key,
+                "ContentType": payload.content_type,
+                "ContentLength": payload.size,
+            },
+            ExpiresIn=UPLOAD_URL_EXPIRES,
+        )
+        return {
+            "key": file_key,
+            "method": "PUT",
+            "url": url,
+            "headers": {"Content-Type": payload.content_type},
+            "image_url": public_url(file_key),
+        }
+
+    upload = r2.create_multipart_upload(
+        Bucket=R2_BUCKET_NAME, Key=file_key, ContentType=payload.content_type
+    )
+    part_count = math.ceil(payload.size / MULTIPART_PART_SIZE)
+    parts = [
+        {
+            "part_number": part_number,
+            "url": r2.generate_presigned_url(
+                "upload_part",
+                Params={
+                    "Bucket": R2_BUCKET_NAME,
+                    "Key": file_key,
+                    "UploadId": upload["UploadId"],
+                    "PartNumber": part_number,
+                },
+                ExpiresIn=UPLOAD_URL_EXPIRES,
+            ),
+        }
+        for part_number in range(1, part_count + 1)
+    ]
+    return {
+        "key": file_key,
+        "method": "PUT",
+        "upload_id": upload["UploadId"],
+        "part_size": MULTIPART_PART_SIZE,
+        "parts": parts,
+        "image_url": public_url(file_key),
+    }
+
+
+@router.post("/image-uploads/complete")
+@query_budget(statements=0, rows=0)
+def complete_image_upload(payload: ImageUploadComplete):
+    """Finish a multipart upload once the browser has sent every part."""
+    check_image_key(payload.key)
+    try:
+        r2.complete_multipart_upload(
+            Bucket=R2_BUCKET_NAME,
+            Key=payload.key,
+            UploadId=payload.upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": part.etag, "PartNumber": part.part_number}
+                    for part in sorted(payload.parts, key=lambda p: p.part_number)
+                ]
+            },
+        )
+    except ClientError as e:
+        print("❌ Completing R2 upload failed:", e)
+        raise HTTPException(status_code=400, detail="Failed to complete upload")
+    # Presigned parts can't bind their size, so check what was assembled
+    check_uploaded_size(payload.key)
+    return {"key": payload.key, "image_url": public_url(payload.key)}
+
+
 # -------------------------
 # Create Product
 # -------------------------
 @router.post("/")
+@query_budget(statements=8, rows=10)
 async def create_product(
+    background_tasks: BackgroundTasks,
     category_id: int = Form(...),
     translations: str = Form(...),
+    image_key: Optional[str] = Form(None),
     image: Optional[UploadFile] = File(None),
     db: Session = Depends(get_db),
 ):
@@ -57,44 +277,48 @@ async def create_product(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid translations JSON: {e}")
 
-    # Verify category
-    category = db.query(Category).filter(Category.id == category_id).first()
-    if not category:
-        raise HTTPException(status_code=400, detail="Invalid category_id")
+    result = await run_blocking(_create_product, db, category_id, translations_data, image_key, image)
+    if result["image_url"]:
+        background_tasks.add_task(generate_product_images, result["id"])
+    return result
 
-    # Upload image to R2
-    image_url = None
-    if image:
-        file_ext = os.path.splitext(image.filename)[1]
-        file_key = f"products/{uuid.uuid4().hex}{file_ext}"
 
+def _create_product(
+    db: Session,
+    category_id: int,
+    translations_data: list,
+    image_key: Optional[str],
+    image: Optional[UploadFile],
+):
+    # Image uploaded directly to R2 (see /image-uploads), or sent inline. This
+    # comes before the first query, so no connection is held during the upload.
+    image_url = None
+    if image_key:
+        image_url = uploaded_image_url(image_key, db)
+    elif image:
         try:
-            r2.put_object(
-                Bucket=os.getenv("R2_BUCKET_NAME"),
-                Key=file_key,
-                Body=await image.read(),
-                ContentType=image.content_type,
-            )
-            # build public url
-            image_url = f"{os.getenv('R2_PUBLIC_URL')}/{file_key}"
+            image_url = upload_product_image(image)
         except Exception as e:
             print("❌ Upload to R2 failed:", e)
             raise HTTPException(status_code=500, detail="Failed to upload image")
 
-    # Generate key
-    en_translation = next((t for t in translations_data if t.get("language_code") == "en"), None)
-    base_key = slugify(en_translation["title"]) if en_translation and en_translation.get("title") else uuid.uuid4().hex[:8]
+    # Verify category
+    category = db.query(Category).filter(Category.id == category_id).first()
+    if not category:
+        if image:
+            # Uploaded just now, so no product can be using it
+            queue_image_deletion(db, [(image_url, None)])
+            db.commit()
+        raise HTTPException(status_code=400, detail="Invalid category_id")
 
-    key = base_key
-    i = 1
-    while db.query(Product).filter(Product.key == key).first():
-        key = f"{base_key}-{i}"
-        i += 1
+    # Create product under a free key
+    def add_product(keys):
+        product = Product(key=keys[0], category_id=category_id, image_url=image_url)
+        db.add(product)
+        db.flush()
+        return product
 
-    # Create product
-    product = Product(key=key, category_id=category_id, image_url=image_url)
-    db.add(product)
-    db.flush()
+    product = with_product_keys(db, [product_base_key(translations_data)], add_product)
 
     # Translations
     for tr in translations_data:
@@ -105,6 +329,7 @@ async def create_product(
             description=tr.get("description", "")
         ))
 
+    bump_catalog_version(db)
     db.commit()
     db.refresh(product)
     return {
@@ -116,17 +341,218 @@ async def create_product(
     }
 
 
+def product_base_key(translations_data: list) -> str:
+    en_translation = next((t for t in translations_data if t.get("language_code") == "en"), None)
+    return slugify(en_translation["title"]) if en_translation and en_translation.get("title") else uuid.uuid4().hex[:8]
+
+
+def taken_keys_query(db: Session, bases):
+    return db.query(Product.key).filter(or_(*[
+        or_(Product.key == base, Product.key.like(like_escape(base) + "-%"))
+        for base in bases
+    ]))
+
+
+def allocate_product_keys(db: Session, base_keys: list) -> list:
+    """Unique keys for base_keys (base, base-1, base-2, ...) from one lookup of the taken ones.
+
+    The lookup is an index range scan on ix_products_key (text_pattern_ops).
+    """
+    bases = set(base_keys)
+    if not bases:
+        return []
+    taken = {key for (key,) in taken_keys_query(db, bases)}
+    keys = []
+    for base in base_keys:
+        key = base
+        i = 1
+        while key in taken:
+            key = f"{base}-{i}"
+            i += 1
+        taken.add(key)
+        keys.append(key)
+    return keys
+
+
+def with_product_keys(db: Session, base_keys: list, write):
+    """Call write(keys) in a savepoint, allocating again if a concurrent create took a key.
+
+    ix_products_key is unique, so the losing insert fails instead of duplicating the key.
+    Postgres reports whichever unique index it checks first, which for a clash in
+    one category may be ix_products_category_key.
+    """
+    for _ in range(KEY_ALLOCATION_ATTEMPTS):
+        keys = allocate_product_keys(db, base_keys)
+        try:
+            with db.begin_nested():
+                return write(keys)
+        except IntegrityError as e:
+            if getattr(e.orig.diag, "constraint_name", None) not in PRODUCT_KEY_CONSTRAINTS:
+                raise
+    raise HTTPException(status_code=409, detail="Could not allocate a product key, please retry")
+
+
+# -------------------------
+# Create / update products in bulk
+# -------------------------
+@router.post("/batch")
+@query_budget(statements=14, rows=30)
+async def batch_products(
+    payload: ProductBatch,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    """Create (no id) or update (id) many products in one transaction.
+
+    Every item is validated first; if any fails nothing is written and the
+    response is a 422 listing the error of each bad item.
+    """
+    results, image_product_ids = await run_blocking(_batch_products, db, payload)
+    for product_id in image_product_ids:
+        background_tasks.add_task(generate_product_images, product_id)
+    background_tasks.add_task(drain_r2_deletions)
+    return {"results": results}
+
+
+def _batch_products(db: Session, payload: ProductBatch):
+    items = payload.items
+
+    # Validate everything up front, one query per table
+    category_ids = {
+        id for (id,) in db.query(Category.id).filter(Category.id.in_({item.category_id for item in items}))
+    }
+    update_ids = {item.id for item in items if item.id is not None}
+    existing = {
+        row.id: row.image_url
+        for row in db.query(Product.id, Product.image_url).filter(Product.id.in_(update_ids))
+    } if update_ids else {}
+
+    errors = {}
+    image_urls = {}
+    seen_ids = set()
+    for index, item in enumerate(items):
+        languages = [tr.language_code for tr in item.translations]
+        if item.category_id not in category_ids:
+            errors[index] = "Invalid category_id"
+        elif item.id is not None and item.id not in existing:
+            errors[index] = "Product not found"
+        elif item.id is not None and item.id in seen_ids:
+            errors[index] = "Product appears more than once"
+        elif len(set(languages)) != len(languages):
+            errors[index] = "Duplicate language_code"
+        elif item.image_key:
+            try:
+                image_urls[index] = uploaded_image_url(item.image_key, db)
+            except HTTPException as e:
+                errors[index] = e.detail
+        if item.id is not None:
+            seen_ids.add(item.id)
+
+    if errors:
+        raise HTTPException(status_code=422, detail=[
+            {"index": index, "status": "error", "detail": detail}
+            for index, detail in sorted(errors.items())
+        ])
+
+    creates = [index for index, item in enumerate(items) if item.id is None]
+    updates = [index for index, item in enumerate(items) if item.id is not None]
+    product_ids = {index: items[index].id for index in updates}
+    keys = {}
+
+    def insert_products(allocated):
+        keys.update(zip(creates, allocated))
+        product_ids.update(zip(creates, db.scalars(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True),
+            [
+                {"key": keys[index], "category_id": items[index].category_id, "image_url": image_urls.get(index)}
+                for index in creates
+            ],
+        )))
+
+    if creates:
+        with_product_keys(
+            db, [product_base_key([tr.model_dump() for tr in items[index].translations]) for index in creates],
+            insert_products,
+        )
+
+    if updates:
+        rows, replaced_images = [], []
+        for index in updates:
+            row = {"id": items[index].id, "category_id": items[index].category_id}
+            if index in image_urls and image_urls[index] != existing[items[index].id]:
+                # New image: drop the old derivatives, regenerated in the background
+                row.update(image_url=image_urls[index], image_width=None, image_height=None,
+                           image_placeholder=None, image_variants=None)
+                replaced_images.append(row["id"])
+            rows.append(row)
+        if replaced_images:
+            queue_image_deletion(db, db.query(Product.image_url, Product.image_variants).filter(
+                Product.id.in_(replaced_images)
+            ).all())
+        db.execute(update(Product), rows)
+
+    sync_translations(db, ProductTranslation, ProductTranslation.product_id, {
+        product_ids[index]: [tr.model_dump() for tr in item.translations]
+        for index, item in enumerate(items)
+    }, PRODUCT_TRANSLATION_FIELDS)
+
+    bump_catalog_version(db)
+    db.commit()
+
+    updated_keys = dict(db.query(Product.id, Product.key).filter(Product.id.in_(update_ids))) if update_ids else {}
+    results = [
+        {
+            "index": index,
+            "status": "updated" if item.id is not None else "created",
+            "id": product_ids[index],
+            "key": updated_keys[item.id] if item.id is not None else keys[index],
+        }
+        for index, item in enumerate(items)
+    ]
+    image_product_ids = [
+        product_ids[index] for index in image_urls
+        if items[index].id is None or image_urls[index] != existing[items[index].id]
+    ]
+    return results, image_product_ids
+
+
 # -------------------------
 # Update Product
 # -------------------------
 @router.put("/{product_id}")
+@query_budget(statements=10, rows=20)
 async def update_product(
     product_id: int,
+    background_tasks: BackgroundTasks,
     category_id: int = Form(...),
     translations: str = Form(...),
+    image_key: Optional[str] = Form(None),
     image: Optional[UploadFile] = File(None),
     existingImage: Optional[str] = Form(None),
     db: Session = Depends(get_db),
+):
+    try:
+        translations_data = json.loads(translations)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid translations JSON: {e}")
+
+    product = await run_blocking(
+        _update_product, db, product_id, category_id, translations_data, image_key, image, existingImage
+    )
+    if product.image_url and product.image_variants is None:
+        background_tasks.add_task(generate_product_images, product.id)
+    background_tasks.add_task(drain_r2_deletions)
+    return product
+
+
+def _update_product(
+    db: Session,
+    product_id: int,
+    category_id: int,
+    translations_data: list,
+    image_key: Optional[str],
+    image: Optional[UploadFile],
+    existingImage: Optional[str],
 ):
     product = db.query(Product).filter(Product.id == product_id).first()
     if not product:
@@ -136,52 +562,107 @@ async def update_product(
     if not category:
         raise HTTPException(status_code=400, detail="Invalid category_id")
 
-    try:
-        translations_data = json.loads(translations)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid translations JSON: {e}")
-
-    if image:
-        file_ext = os.path.splitext(image.filename)[1]
-        file_key = f"products/{uuid.uuid4().hex}{file_ext}"
+    previous_image = (product.image_url, product.image_variants)
+    if image_key:
+        product.image_url = uploaded_image_url(image_key, db)
+    elif image:
         try:
-            r2.put_object(
-                Bucket=os.getenv("R2_BUCKET_NAME"),
-                Key=file_key,
-                Body=await image.read(),
-                ContentType=image.content_type,
-            )
-            product.image_url = f"{os.getenv('R2_PUBLIC_URL')}/{file_key}"
+            product.image_url = upload_product_image(image)
         except Exception as e:
             print("❌ R2 update failed:", e)
             raise HTTPException(status_code=500, detail="Failed to update image")
     elif existingImage:
         product.image_url = existingImage
 
+    # A new image needs new derivatives; update_product regenerates them in the background
+    if product.image_url != previous_image[0]:
+        queue_image_deletion(db, [previous_image])
+        product.image_width = None
+        product.image_height = None
+        product.image_placeholder = None
+        product.image_variants = None
+
     product.category_id = category_id
 
-    db.query(ProductTranslation).filter(ProductTranslation.product_id == product.id).delete()
-    for tr in translations_data:
-        db.add(ProductTranslation(
-            product_id=product.id,
-            language_code=tr["language_code"],
-            title=tr.get("title", ""),
-            description=tr.get("description", "")
-        ))
+    sync_translations(db, ProductTranslation, ProductTranslation.product_id, {
+        product.id: [
+            {
+                "language_code": tr["language_code"],
+                "title": tr.get("title", ""),
+                "description": tr.get("description", ""),
+            }
+            for tr in translations_data
+        ]
+    }, PRODUCT_TRANSLATION_FIELDS)
 
+    bump_catalog_version(db)
     db.commit()
     db.refresh(product)
     return product
 
 
+# -------------------------
+# Update one translation
+# -------------------------
+@router.patch("/{product_id}/translations/{language_code}")
+@query_budget(statements=6, rows=10)
+def patch_product_translation(
+    product_id: int,
+    language_code: str,
+    payload: ProductTranslationPatch,
+    db: Session = Depends(get_db),
+):
+    """Create or change a single language; the other translations are left alone."""
+    if not db.query(Product.id).filter(Product.id == product_id).first():
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    values = payload.model_dump(exclude_unset=True, exclude_none=True)
+    exists = db.query(ProductTranslation.id).filter(
+        ProductTranslation.product_id == product_id,
+        ProductTranslation.language_code == language_code,
+    ).first()
+    if not exists:
+        values = {"title": "", "description": "", **values}
+
+    changes = sync_translations(db, ProductTranslation, ProductTranslation.product_id, {
+        product_id: [{"language_code": language_code, **values}]
+    }, PRODUCT_TRANSLATION_FIELDS, delete_missing=False)
+    if changes["inserted"] or changes["updated"]:
+        bump_catalog_version(db)
+    db.commit()
+
+    translation = db.query(ProductTranslation).filter(
+        ProductTranslation.product_id == product_id,
+        ProductTranslation.language_code == language_code,
+    ).one()
+    return {
+        "id": translation.id,
+        "product_id": product_id,
+        "language_code": translation.language_code,
+        "title": translation.title,
+        "description": translation.description,
+    }
+
+
 # -------------------------
 # Delete Product
 # -------------------------
 @router.delete("/{product_id}")
-async def delete_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
+@query_budget(statements=3, rows=5)
+async def delete_product(product_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    result = await run_blocking(_delete_product, db, product_id)
+    background_tasks.add_task(drain_r2_deletions)
+    return result
+
+
+def _delete_product(db: Session, product_id: int):
+    # Translations go with it (ON DELETE CASCADE)
+    deleted = db.execute(
+        delete(Product).where(Product.id == product_id).returning(Product.image_url, Product.image_variants)
+    ).all()
+    if not deleted:
         raise HTTPException(status_code=404, detail="Product not found")
-    db.delete(product)
+    queue_image_deletion(db, deleted)
+    bump_catalog_version(db)
     db.commit()
     return {"message": "Product deleted"}
@@ -0,0 +1,82 @@
+import io
+import os
+from typing import List, Optional
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.executor import run_blocking
+from app.export_catalog import EXPORT_FORMATS, stream_export
+from app.import_from_json import (
+    LOCALES, collect_catalog, collect_export, import_catalog, parse_locales, read_export,
+)
+from app.query_budgets import query_budget
+
+router = APIRouter()
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _load_export(data: bytes, fmt: str) -> dict:
+    return collect_export(read_export(io.StringIO(data.decode("utf-8"), newline=""), fmt))
+
+
+# -------------------------
+# Import locale files or a catalog export
+# -------------------------
+@router.post("/import")
+@query_budget(statements=5, rows=150)
+async def import_locales(
+    files: List[UploadFile] = File(...),
+    dry_run: bool = Form(False),
+    db: Session = Depends(get_db),
+):
+    """Upsert the catalog from <lang>.json locale files or one .ndjson/.csv export; dry_run only reports the diff."""
+    exports = [u for u in files if os.path.splitext(u.filename or "")[1].lstrip(".") in EXPORT_FORMATS]
+    if exports:
+        if len(files) != 1:
+            raise HTTPException(status_code=400, detail="Upload a single catalog export at a time")
+        upload = exports[0]
+        fmt = os.path.splitext(upload.filename)[1].lstrip(".")
+        data = await upload.read()
+        try:
+            catalog = await run_blocking(_load_export, data, fmt)
+        except (ValueError, KeyError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid catalog export: {e}")
+    else:
+        sources = {}
+        for upload in files:
+            lang = os.path.splitext(os.path.basename(upload.filename or ""))[0]
+            if lang not in LOCALES:
+                raise HTTPException(status_code=400, detail=f"Unexpected locale file: {upload.filename}")
+            sources[lang] = await upload.read()
+
+        try:
+            locales = await run_blocking(parse_locales, sources)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid locale JSON: {e}")
+        catalog = collect_catalog(locales)
+
+    try:
+        diff = await run_blocking(import_catalog, db, catalog, dry_run)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid catalog: {e}")
+    return {"dry_run": dry_run, "diff": diff}
+
+
+# -------------------------
+# Export the catalog
+# -------------------------
+@router.get("/export")
+@query_budget(statements=2, rows=0)  # rows stream through a server-side cursor, which reports no rowcount
+def export_catalog(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    language_code: Optional[str] = None,
+):
+    """Stream every category and product; rows come off a server-side cursor."""
+    filename = f"catalog{'-' + language_code if language_code else ''}.{format}"
+    return StreamingResponse(
+        stream_export(format, language_code),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,70 +1,168 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from sqlalchemy import delete, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.database import get_db
+from app.catalog_cache import bump_catalog_version
+from app.metrics import timed
 from app.models.admin import Category, CategoryTranslation, Product, ProductTranslation
-from app.schemas.categorymanager import CategoryOutSchema, CategoryCreateSchema, CategoryUpdateSchema
+from app.r2_cleanup import drain_r2_deletions, queue_image_deletion
+from app.schemas.categorymanager import (
+    CategoryOutSchema, CategoryCreateSchema, CategoryUpdateSchema, CategoryTranslationPatchSchema,
+)
+from app.translations import sync_translations
+from app.utils import contains_pattern, in_fieldset, pagination_headers, parse_fieldset
+from app.query_budgets import query_budget
 import json
 import logging
 
 router = APIRouter()
 
+CATEGORY_TRANSLATION_FIELDS = ["title", "intro"]
+# fields= apply at every level of the tree (category, product, translation)
+CATEGORY_TREE_FIELDS = ["id", "key", "references_json", "image_url", "title", "intro", "description"]
+CATEGORY_TREE_INCLUDES = ["translations", "products"]
+
 # 🛠️ UTF-8 safe JSON response helper
 def safe_json_response(data):
-    return Response(
-        content=json.dumps(data, ensure_ascii=False),
-        media_type="application/json; charset=utf-8",
+    with timed("serialize"):
+        content = json.dumps(data, ensure_ascii=False)
+    return Response(content=content, media_type="application/json; charset=utf-8")
+
+# 🌳 One row per category, with translations and products nested by Postgres.
+# Each level is a correlated jsonb_agg subquery, so the rows returned grow with
+# the number of categories instead of categories × products × translations.
+def _jsonb_list(element, order_by):
+    return func.coalesce(
+        func.jsonb_agg(aggregate_order_by(element, order_by)),
+        literal_column("'[]'::jsonb"),
     )
 
-# 📦 Helper to convert Category to dict
-def category_to_dict(category: Category):
-    return {
-        "id": category.id,
-        "key": category.key,
-        "references_json": json.loads(category.references_json) if category.references_json else [],
-        "translations": [
-            {
-                "id": t.id,
-                "language_code": t.language_code,
-                "title": t.title,
-                "intro": t.intro
-            }
-            for t in category.translations
-        ],
-        "products": [
-            {
-                "id": p.id,
-                "key": p.key,
-                "image_url": p.image_url,
-                "translations": [
-                    {
-                        "id": pt.id,
-                        "language_code": pt.language_code,
-                        "title": pt.title,
-                        "description": pt.description
-                    }
-                    for pt in p.translations
-                ]
-            }
-            for p in category.products
-        ]
-    }
-
-# ✅ GET all categories (with products and translations)
+
+def _jsonb_object(fields, *pairs):
+    """jsonb_build_object over the (name, column) pairs in the fieldset; id and language_code always."""
+    args = []
+    for name, column in pairs:
+        if name in ("id", "language_code") or in_fieldset(fields, name):
+            args += [name, column]
+    return func.jsonb_build_object(*args)
+
+
+def category_tree_query(fields=None, include=None):
+    """Categories with nested translations and products; fields/include trim it (see CATEGORY_TREE_FIELDS)."""
+    with_translations = in_fieldset(include, "translations")
+    product_translations = (
+        select(_jsonb_list(
+            _jsonb_object(
+                fields,
+                ("id", ProductTranslation.id),
+                ("language_code", ProductTranslation.language_code),
+                ("title", ProductTranslation.title),
+                ("description", ProductTranslation.description),
+            ),
+            ProductTranslation.id,
+        ))
+        .where(ProductTranslation.product_id == Product.id)
+        .scalar_subquery()
+    )
+    products = (
+        select(_jsonb_list(
+            _jsonb_object(
+                fields,
+                ("id", Product.id),
+                ("key", Product.key),
+                ("image_url", Product.image_url),
+                *([("translations", product_translations)] if with_translations else []),
+            ),
+            Product.id,
+        ))
+        .where(Product.category_id == Category.id)
+        .scalar_subquery()
+    )
+    translations = (
+        select(_jsonb_list(
+            _jsonb_object(
+                fields,
+                ("id", CategoryTranslation.id),
+                ("language_code", CategoryTranslation.language_code),
+                ("title", CategoryTranslation.title),
+                ("intro", CategoryTranslation.intro),
+            ),
+            CategoryTranslation.id,
+        ))
+        .where(CategoryTranslation.category_id == Category.id)
+        .scalar_subquery()
+    )
+    columns = [Category.id]
+    if in_fieldset(fields, "key"):
+        columns.append(Category.key)
+    if in_fieldset(fields, "references_json"):
+        columns.append(Category.references_json)
+    if with_translations:
+        columns.append(translations.label("translations"))
+    if in_fieldset(include, "products"):
+        columns.append(products.label("products"))
+    return select(*columns).order_by(Category.id)
+
+
+# 📦 Helper to convert a category_tree_query() row to dict
+def category_to_dict(row):
+    row = row._mapping
+    data = {name: row[name] for name in ("id", "key", "references_json", "translations", "products") if name in row}
+    if "references_json" in data:
+        data["references_json"] = data["references_json"] or []
+    return data
+
+
+def get_category_tree(db: Session, category_id: int):
+    row = db.execute(category_tree_query().where(Category.id == category_id)).first()
+    return category_to_dict(row) if row else None
+
+def category_list_filters(q: Optional[str] = None) -> list:
+    filters = []
+    if q:
+        # Matches the key or a title in any language (trigram indexes)
+        pattern = contains_pattern(q)
+        filters.append(or_(
+            Category.key.ilike(pattern),
+            Category.id.in_(
+                select(CategoryTranslation.category_id).where(CategoryTranslation.title.ilike(pattern))
+            ),
+        ))
+    return filters
+
+# ✅ GET categories (with products and translations), keyset-paginated
 @router.get("/", response_model=List[CategoryOutSchema])
-def list_categories(db: Session = Depends(get_db)):
+@query_budget(statements=2, rows=10)
+def list_categories(
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    after_id: Optional[int] = None,
+    q: Optional[str] = None,
+    with_total: bool = True,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return at every level; ids are always included"),
+    include: Optional[str] = Query(None, description="Comma-separated nested lists to return (translations, products); empty for none"),
+    db: Session = Depends(get_db),
+):
+    filters = category_list_filters(q)
+    query = category_tree_query(
+        parse_fieldset(fields, CATEGORY_TREE_FIELDS),
+        parse_fieldset(include, CATEGORY_TREE_INCLUDES, "include"),
+    )
     try:
-        categories = (
-            db.query(Category)
-            .options(
-                joinedload(Category.translations),
-                joinedload(Category.products).joinedload(Product.translations),
-            )
-            .all()
-        )
+        query = query.where(*filters)
+        if after_id is not None:
+            query = query.where(Category.id > after_id)
+        if limit is not None:
+            query = query.limit(limit)
+        categories = db.execute(query).all()
+        total = db.query(func.count(Category.id)).filter(*filters).scalar() if with_total else None
+
         result = [category_to_dict(c) for c in categories]
-        return safe_json_response(result)
+        response = safe_json_response(result)
+        response.headers.update(pagination_headers([c.id for c in categories], limit, total))
+        return response
     except SQLAlchemyError as e:
         logging.exception("Database error while fetching categories")
         raise HTTPException(status_code=500, detail="Database error")
@@ -72,17 +170,13 @@ def list_categories(db: Session = Depends(get_db)):
 
 # ✅ Create new category
 @router.post("/", response_model=CategoryOutSchema)
+@query_budget(statements=6, rows=10)
 def create_category(payload: CategoryCreateSchema, db: Session = Depends(get_db)):
     existing = db.query(Category).filter(Category.key == payload.key).first()
     if existing:
         raise HTTPException(status_code=400, detail="Category key already exists")
 
-    references = payload.references_json or "[]"
-
-    category = Category(
-        key=payload.key,
-        references_json=json.dumps(references) if isinstance(references, list) else references,
-    )
+    category = Category(key=payload.key, references_json=payload.references_json or [])
     db.add(category)
     db.flush()
 
@@ -94,13 +188,14 @@ def create_category(payload: CategoryCreateSchema, db: Session = Depends(get_db)
             intro=t.intro
         ))
 
+    bump_catalog_version(db)
     db.commit()
-    db.refresh(category)
-    return safe_json_response(category_to_dict(category))
+    return safe_json_response(get_category_tree(db, category.id))
 
 
 # ✅ Update existing category
 @router.put("/{category_id}", response_model=CategoryOutSchema)
+@query_budget(statements=7, rows=20)
 def update_category(category_id: int, payload: CategoryUpdateSchema, db: Session = Depends(get_db)):
     category = db.query(Category).filter(Category.id == category_id).first()
     if not category:
@@ -109,43 +204,74 @@ def update_category(category_id: int, payload: CategoryUpdateSchema, db: Session
     if payload.key is not None:
         category.key = payload.key
     if payload.references_json is not None:
-        category.references_json = json.dumps(payload.references_json) if isinstance(payload.references_json, list) else payload.references_json
+        category.references_json = payload.references_json
 
-    # Clear and re-add translations
-    category.translations.clear()
-    db.flush()
-    for t in payload.translations:
-        category.translations.append(CategoryTranslation(
-            language_code=t.language_code,
-            title=t.title,
-            intro=t.intro
-        ))
+    # Only the languages that changed are written
+    if payload.translations is not None:
+        sync_translations(db, CategoryTranslation, CategoryTranslation.category_id, {
+            category.id: [t.model_dump() for t in payload.translations]
+        }, CATEGORY_TRANSLATION_FIELDS)
 
+    bump_catalog_version(db)
     db.commit()
-    db.refresh(category)
-    return safe_json_response(category_to_dict(category))
+    return safe_json_response(get_category_tree(db, category.id))
+
+
+# ✅ Create or change one translation
+@router.patch("/{category_id}/translations/{language_code}", response_model=CategoryOutSchema)
+@query_budget(statements=5, rows=10)
+def patch_category_translation(
+    category_id: int,
+    language_code: str,
+    payload: CategoryTranslationPatchSchema,
+    db: Session = Depends(get_db),
+):
+    if not db.query(Category.id).filter(Category.id == category_id).first():
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    values = payload.model_dump(exclude_unset=True)
+    if payload.title is None:
+        values.pop("title", None)
+        exists = db.query(CategoryTranslation.id).filter(
+            CategoryTranslation.category_id == category_id,
+            CategoryTranslation.language_code == language_code,
+        ).first()
+        if not exists:
+            raise HTTPException(status_code=400, detail="A new translation needs a title")
+
+    changes = sync_translations(db, CategoryTranslation, CategoryTranslation.category_id, {
+        category_id: [{"language_code": language_code, **values}]
+    }, CATEGORY_TRANSLATION_FIELDS, delete_missing=False)
+    if changes["inserted"] or changes["updated"]:
+        bump_catalog_version(db)
+    db.commit()
+    return safe_json_response(get_category_tree(db, category_id))
 
 
 # ✅ Delete category
 @router.delete("/{category_id}")
-def delete_category(category_id: int, db: Session = Depends(get_db)):
-    category = db.query(Category).filter(Category.id == category_id).first()
-    if not category:
+@query_budget(statements=4, rows=10)
+def delete_category(category_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    # Products and translations go with it (ON DELETE CASCADE); products are
+    # deleted first only to collect their images
+    images = db.execute(
+        delete(Product).where(Product.category_id == category_id).returning(Product.image_url, Product.image_variants)
+    ).all()
+    if not db.execute(delete(Category).where(Category.id == category_id)).rowcount:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Category not found")
-    db.delete(category)
+    queue_image_deletion(db, images)
+    bump_catalog_version(db)
     db.commit()
+    background_tasks.add_task(drain_r2_deletions)
     return {"success": True}
 
 
 # ✅ Get products for a category
 @router.get("/{category_id}/products")
+@query_budget(statements=1, rows=5)
 def list_products_in_category(category_id: int, db: Session = Depends(get_db)):
-    category = (
-        db.query(Category)
-        .options(joinedload(Category.products).joinedload(Product.translations))
-        .filter(Category.id == category_id)
-        .first()
-    )
+    category = get_category_tree(db, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
-    return safe_json_response([p for p in category_to_dict(category)["products"]])
+    return safe_json_response(category["products"])
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from app.schemas.contact import ContactForm
 from app.mailer import send_contact_email
+from app.query_budgets import query_budget
 import asyncio
 
 router = APIRouter()
 
 @router.post("/contact")
+@query_budget(statements=0, rows=0)
 async def submit_contact(form: ContactForm):
     # Run the email sending in a thread (since Brevo SDK is sync)
     loop = asyncio.get_event_loop()
@@ -1,67 +1,495 @@
-import time
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session, joinedload
+from collections import defaultdict
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import String, and_, cast, func, literal, or_, select, text, type_coerce, union
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG, aggregate_order_by, array
+from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.admin import Category, Product
-import json
+from app.models.admin import (
+    TEXT_SEARCH_CONFIGS,
+    Category,
+    CategoryTranslation,
+    CatalogTombstone,
+    Product,
+    ProductTranslation,
+)
+from app.catalog_cache import (
+    catalog_cache_headers,
+    catalog_etag,
+    current_catalog_version,
+    etag_matches,
+    get_catalog_snapshot,
+)
+from app.languages import language_chain
+from app.payloads import payload_response, render_payload
+from app.utils import in_fieldset, parse_fieldset
+from app.query_budgets import query_budget
 
 router = APIRouter()
 
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 50
+SEARCH_MAX_OFFSET = 1000
+SEARCH_CATEGORY_LIMIT = 5
+# Titles are highlighted whole; descriptions and intros are cut to the best fragments.
+# The text is HTML-escaped first (_html_escaped), so highlights are safe HTML
+# whose only tags are <mark>.
+HEADLINE_TITLE = "StartSel=<mark>, StopSel=</mark>, HighlightAll=true"
+HEADLINE_SNIPPET = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10"
+
+# Sparse fieldsets: fields= names the attributes to return (on categories and
+# products alike; id and key always come back), include= the nested objects.
+# Only the selected columns are read from Postgres.
+PRODUCT_FIELDS = [
+    "id", "key", "title", "description",
+    "image_url", "image_width", "image_height", "image_placeholder", "image_variants",
+]
+CATEGORY_FIELDS = ["id", "key", "title", "intro", "references"]
+CATALOG_FIELDS = list(dict.fromkeys(CATEGORY_FIELDS + PRODUCT_FIELDS))
+FIELDS_DESCRIPTION = "Comma-separated fields to return; id and key are always included"
+INCLUDE_DESCRIPTION = "Comma-separated nested objects to return; empty for none"
+FALLBACK_DESCRIPTION = "Fill missing translations from the fallback chain"
+
+
+def _languages(language_code: str, request: Request, fallback: bool) -> list:
+    return language_chain(language_code, request.headers.get("accept-language"), fallback)
+
+
 @router.get("/{language_code}")
-def get_products(language_code: str, db: Session = Depends(get_db)):
-    start_total = time.time()
-    print("⚡ get_products called")
-
-    # --- DB query timing ---
-    start_query = time.time()
-    categories = db.query(Category).options(
-        joinedload(Category.products).joinedload(Product.translations),
-        joinedload(Category.translations)
-    ).all()
-    end_query = time.time()
-
-    # --- Processing timing ---
-    start_process = time.time()
-    result = []
-    for category in categories:
-        cat_translation = next(
-            (t for t in category.translations if t.language_code == language_code),
-            None
+@query_budget(statements=4, rows=30)
+def get_products(
+    language_code: str,
+    request: Request,
+    fallback: bool = Query(True, description=FALLBACK_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION + " (products)"),
+    db: Session = Depends(get_db),
+):
+    languages = _languages(language_code, request, fallback)
+    fieldset = (parse_fieldset(fields, CATALOG_FIELDS), parse_fieldset(include, ["products"], "include"))
+    if any(part is not None for part in fieldset):
+        # Any subset of fields may be asked for, so sparse catalogs are not snapshotted
+        return _slice_response(request, db, (*languages, *fieldset), lambda: build_catalog(db, languages, *fieldset))
+
+    # Answer revalidations from the in-memory version alone
+    etag = catalog_etag(current_catalog_version(db), *languages, *fieldset)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=catalog_cache_headers(etag))
+
+    version, bodies = get_catalog_snapshot(db, languages, build_catalog)
+    return payload_response(
+        bodies,
+        request.headers.get("accept-encoding"),
+        headers=catalog_cache_headers(catalog_etag(version, *languages, *fieldset)),
+    )
+
+
+@router.get("/{language_code}/categories/{category_key}")
+@query_budget(statements=3, rows=10)
+def get_category(
+    language_code: str,
+    category_key: str,
+    request: Request,
+    fallback: bool = Query(True, description=FALLBACK_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION + " (products)"),
+    db: Session = Depends(get_db),
+):
+    languages = _languages(language_code, request, fallback)
+    fields = parse_fieldset(fields, CATALOG_FIELDS)
+    include = parse_fieldset(include, ["products"], "include")
+    return _slice_response(
+        request, db, ("category", tuple(languages), category_key, fields, include),
+        lambda: build_category(db, languages, category_key, fields, include),
+    )
+
+
+@router.get("/{language_code}/items/{product_key}")
+@query_budget(statements=3, rows=5)
+def get_product(
+    language_code: str,
+    product_key: str,
+    request: Request,
+    fallback: bool = Query(True, description=FALLBACK_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION + " (category)"),
+    db: Session = Depends(get_db),
+):
+    languages = _languages(language_code, request, fallback)
+    fields = parse_fieldset(fields, PRODUCT_FIELDS)
+    include = parse_fieldset(include, ["category"], "include")
+    return _slice_response(
+        request, db, ("item", tuple(languages), product_key, fields, include),
+        lambda: build_product(db, languages, product_key, fields, include),
+    )
+
+
+@router.get("/{language_code}/changes")
+@query_budget(statements=6, rows=30)
+def get_changes(
+    language_code: str,
+    request: Request,
+    since: int = Query(0, ge=0),
+    fallback: bool = Query(True, description=FALLBACK_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_db),
+):
+    """Rows changed and ids deleted since a previous response's "version"; since=0 returns everything."""
+    languages = _languages(language_code, request, fallback)
+    fields = parse_fieldset(fields, CATALOG_FIELDS)
+    return _slice_response(
+        request, db, ("changes", tuple(languages), since, fields),
+        lambda: build_changes(db, languages, since, fields),
+    )
+
+
+@router.get("/{language_code}/search")
+@query_budget(statements=3, rows=25)
+def search_catalog(
+    language_code: str,
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words, \"quoted phrases\", or and -excluded words"),
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=SEARCH_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=SEARCH_MAX_OFFSET),
+    db: Session = Depends(get_db),
+):
+    """Products (a page) and categories matching q in one language, best first.
+
+    title_highlight and snippet are HTML: the escaped text with <mark> around matches.
+    """
+    return _slice_response(
+        request, db, ("search", language_code, q, limit, offset),
+        lambda: build_search(db, language_code, q, limit, offset),
+    )
+
+
+def _slice_response(request: Request, db: Session, etag_parts: tuple, build):
+    """Serve one slice of the catalog, revalidated against the catalog version."""
+    etag = catalog_etag(current_catalog_version(db), *etag_parts)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=catalog_cache_headers(etag))
+
+    data = build()
+    if data is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return payload_response(
+        render_payload(data, compress=False),
+        request.headers.get("accept-encoding"),
+        headers=catalog_cache_headers(etag),
+    )
+
+
+# --- Queries: translations in every language of the chain are joined and
+# grouped back to one row per category/product. Each field takes the first
+# non-empty value along the chain, with the language it came from.
+def _resolved(model, field: str, languages: list):
+    column = getattr(model, field)
+    rank = func.array_position(array(languages, type_=String), model.language_code)
+    filled = func.coalesce(column, "") != ""
+
+    def first(value):
+        ordered = func.array_agg(aggregate_order_by(value, rank)).filter(filled)
+        return type_coerce(ordered, ARRAY(String))[1]
+
+    return (
+        func.coalesce(first(column), "").label(field),
+        first(model.language_code).label(f"{field}_language"),
+    )
+
+
+def _category_query(db: Session, languages: list, fields=None):
+    columns = [Category.id, Category.key]
+    if in_fieldset(fields, "references"):
+        columns.append(Category.references_json.label("references"))
+    translated = [field for field in ("title", "intro") if in_fieldset(fields, field)]
+    query = db.query(*columns, *[c for field in translated for c in _resolved(CategoryTranslation, field, languages)])
+    if translated:
+        query = query.outerjoin(
+            CategoryTranslation,
+            and_(
+                CategoryTranslation.category_id == Category.id,
+                CategoryTranslation.language_code.in_(languages),
+            ),
+        ).group_by(Category.id)
+    return query.order_by(Category.id)
+
+
+def _product_query(db: Session, languages: list, fields=None):
+    # The join stays even without translated fields: it decides which products are listed
+    columns = [Product.id, Product.category_id, Product.key]
+    columns += [
+        getattr(Product, field)
+        for field in ("image_url", "image_width", "image_height", "image_placeholder", "image_variants")
+        if in_fieldset(fields, field)
+    ]
+    columns += [
+        column
+        for field in ("title", "description") if in_fieldset(fields, field)
+        for column in _resolved(ProductTranslation, field, languages)
+    ]
+    return (
+        db.query(*columns)
+        .join(
+            ProductTranslation,
+            and_(
+                ProductTranslation.product_id == Product.id,
+                ProductTranslation.language_code.in_(languages),
+            ),
         )
-        title = cat_translation.title if cat_translation else ""
-        intro = cat_translation.intro if cat_translation else ""
-
-        try:
-            references = json.loads(category.references_json) if category.references_json else []
-        except Exception:
-            references = []
-
-        products = []
-        for product in category.products:
-            prod_translation = next(
-                (t for t in product.translations if t.language_code == language_code),
-                None
-            )
-            if prod_translation:
-                products.append({
-                    "id": product.id,
-                    "key": product.key,
-                    "title": prod_translation.title,
-                    "description": prod_translation.description,
-                    "image_url": product.image_url
-                })
-
-        result.append({
-            "id": category.id,
-            "key": category.key,
-            "title": title,
-            "intro": intro,
-            "references": references,
-            "products": products
-        })
-    end_process = time.time()
-
-    end_total = time.time()
-    print(f"⏱️ Query: {end_query - start_query:.3f}s | Processing: {end_process - start_process:.3f}s | Total: {end_total - start_total:.3f}s")
+        .group_by(Product.id)
+        .order_by(Product.id)
+    )
+
+
+def _fallbacks(row, language_code: str) -> dict:
+    """{field: language} for the selected fields served from a fallback language."""
+    return {
+        key.removesuffix("_language"): lang
+        for key, lang in row.items()
+        if key.endswith("_language") and lang and lang != language_code
+    }
+
+
+def _product_to_dict(product, language_code: str):
+    # Emits exactly the columns _product_query selected
+    row = product._mapping
+    data = {field: row[field] for field in PRODUCT_FIELDS if field in row}
+    if "image_variants" in data:
+        data["image_variants"] = data["image_variants"] or []
+    fallbacks = _fallbacks(row, language_code)
+    if fallbacks:
+        data["fallbacks"] = fallbacks
+    return data
+
+
+def _category_to_dict(category, products, language_code: str):
+    row = category._mapping
+    data = {field: row[field] for field in CATEGORY_FIELDS if field in row}
+    if "references" in data:
+        data["references"] = data["references"] or []
+    if products is not None:
+        data["products"] = products
+    fallbacks = _fallbacks(row, language_code)
+    if fallbacks:
+        data["fallbacks"] = fallbacks
+    return data
+
+
+def build_catalog(db: Session, languages: list, fields=None, include=None):
+    categories = _category_query(db, languages, fields).all()
+    products = _product_query(db, languages, fields).all() if in_fieldset(include, "products") else None
 
+    products_by_category = defaultdict(list)
+    for product in products or []:
+        products_by_category[product.category_id].append(_product_to_dict(product, languages[0]))
+
+    result = [
+        _category_to_dict(category, products_by_category[category.id] if products is not None else None, languages[0])
+        for category in categories
+    ]
     return {"categories": result or []}
+
+
+def build_category(db: Session, languages: list, category_key: str, fields=None, include=None):
+    # categories.key is unique; products are read through ix_products_category_id_id
+    category = _category_query(db, languages, fields).filter(Category.key == category_key).first()
+    if not category:
+        return None
+    products = None
+    if in_fieldset(include, "products"):
+        products = [
+            _product_to_dict(p, languages[0])
+            for p in _product_query(db, languages, fields).filter(Product.category_id == category.id)
+        ]
+    return _category_to_dict(category, products, languages[0])
+
+
+def build_product(db: Session, languages: list, product_key: str, fields=None, include=None):
+    # products.key is unique across categories (ix_products_key), so the key alone names one product
+    product = _product_query(db, languages, fields).filter(Product.key == product_key).one_or_none()
+    if not product:
+        return None
+    data = _product_to_dict(product, languages[0])
+    if in_fieldset(include, "category"):
+        category = _category_query(db, languages, ("title",)).filter(Category.id == product.category_id).first()
+        data["category"] = {"id": category.id, "key": category.key, "title": category.title}
+    return data
+
+
+# --- Changes since a version (see CHANGE_TRACKING_FUNCTIONS in app/models/admin.py)
+def _tombstones(table_name: str, since: int, column=CatalogTombstone.row_id, languages=None):
+    query = select(column).where(CatalogTombstone.table_name == table_name, CatalogTombstone.version >= since)
+    if languages is not None:
+        query = query.where(CatalogTombstone.language_code.in_(languages))
+    return query
+
+
+def _changed_translations(model, parent_column, table_name: str, languages: list, since: int):
+    """Parents whose translations in the chain were written or deleted since the version."""
+    return union(
+        select(parent_column).where(model.language_code.in_(languages), model.version >= since),
+        _tombstones(table_name, since, CatalogTombstone.parent_id, languages),
+    )
+
+
+def build_changes(db: Session, languages: list, since: int, fields=None):
+    # Read first: whatever the queries below miss was written by a transaction
+    # at or above this id, so the next call with since=version picks it up
+    version = db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar()
+
+    categories = _category_query(db, languages, fields).filter(or_(
+        Category.version >= since,
+        Category.id.in_(_changed_translations(
+            CategoryTranslation, CategoryTranslation.category_id, "category_translations", languages, since
+        )),
+    )).all()
+
+    products = _product_query(db, languages, fields).filter(or_(
+        Product.version >= since,
+        Product.id.in_(_changed_translations(
+            ProductTranslation, ProductTranslation.product_id, "product_translations", languages, since
+        )),
+    )).all()
+
+    # A product that lost its last translation in the chain drops out of the catalog too
+    changed_product_ids = {product.id for product in products}
+    deleted_products = {
+        product_id for (product_id,) in db.execute(union(
+            _tombstones("products", since),
+            _tombstones("product_translations", since, CatalogTombstone.parent_id, languages),
+        ))
+    } - changed_product_ids
+    deleted_categories = {category_id for (category_id,) in db.execute(_tombstones("categories", since))}
+
+    return {
+        "since": since,
+        "version": version,
+        "categories": [
+            _category_to_dict(category, None, languages[0])
+            for category in categories
+        ],
+        "products": [
+            {**_product_to_dict(product, languages[0]), "category_id": product.category_id}
+            for product in products
+        ],
+        "deleted": {
+            "categories": sorted(deleted_categories),
+            "products": sorted(deleted_products),
+        },
+    }
+
+
+# --- Full-text search (see TEXT_SEARCH_CONFIGS in app/models/admin.py)
+def _search_terms(language_code: str, q: str):
+    """(regconfig, tsquery) for q, parsed with the language's own configuration."""
+    config = cast(literal(TEXT_SEARCH_CONFIGS.get(language_code, "simple")), REGCONFIG)
+    return config, func.websearch_to_tsquery(config, q)
+
+
+def product_search_query(language_code: str, q: str):
+    """Matching product translations, best first. Only ids and ranks, so
+    highlighting runs on the returned page alone."""
+    _, ts_query = _search_terms(language_code, q)
+    rank = func.ts_rank_cd(ProductTranslation.search_vector, ts_query)
+    return (
+        select(ProductTranslation.id, rank.label("rank"))
+        .where(
+            ProductTranslation.language_code == language_code,
+            ProductTranslation.search_vector.op("@@")(ts_query),
+        )
+        .order_by(rank.desc(), ProductTranslation.id)
+    )
+
+
+def category_search_query(language_code: str, q: str):
+    _, ts_query = _search_terms(language_code, q)
+    rank = func.ts_rank_cd(CategoryTranslation.search_vector, ts_query)
+    return (
+        select(CategoryTranslation.id, rank.label("rank"))
+        .where(
+            CategoryTranslation.language_code == language_code,
+            CategoryTranslation.search_vector.op("@@")(ts_query),
+        )
+        .order_by(rank.desc(), CategoryTranslation.id)
+    )
+
+
+def _html_escaped(column):
+    """column with &, <, >, " and ' escaped, for ts_headline output that is rendered as HTML."""
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;")):
+        column = func.replace(column, char, entity)
+    return column
+
+
+def _headline(config, column, ts_query, options: str):
+    return func.ts_headline(config, _html_escaped(column), ts_query, options)
+
+
+def build_search(db: Session, language_code: str, q: str, limit: int, offset: int):
+    config, ts_query = _search_terms(language_code, q)
+
+    # One row past the page tells whether there is a next one
+    page = product_search_query(language_code, q).limit(limit + 1).offset(offset).subquery()
+    products = db.execute(
+        select(
+            Product.key,
+            Category.key.label("category_key"),
+            Product.image_url,
+            Product.image_width,
+            Product.image_height,
+            Product.image_placeholder,
+            ProductTranslation.title,
+            _headline(config, ProductTranslation.title, ts_query, HEADLINE_TITLE).label("title_highlight"),
+            _headline(config, ProductTranslation.description, ts_query, HEADLINE_SNIPPET).label("snippet"),
+            page.c.rank,
+        )
+        .join(ProductTranslation, ProductTranslation.id == page.c.id)
+        .join(Product, Product.id == ProductTranslation.product_id)
+        .join(Category, Category.id == Product.category_id)
+        .order_by(page.c.rank.desc(), page.c.id)
+    ).all()
+
+    top = category_search_query(language_code, q).limit(SEARCH_CATEGORY_LIMIT).subquery()
+    categories = db.execute(
+        select(
+            Category.key,
+            CategoryTranslation.title,
+            _headline(config, CategoryTranslation.title, ts_query, HEADLINE_TITLE).label("title_highlight"),
+            func.coalesce(_headline(config, CategoryTranslation.intro, ts_query, HEADLINE_SNIPPET), "").label("snippet"),
+            top.c.rank,
+        )
+        .join(CategoryTranslation, CategoryTranslation.id == top.c.id)
+        .join(Category, Category.id == CategoryTranslation.category_id)
+        .order_by(top.c.rank.desc(), top.c.id)
+    ).all() if offset == 0 else []
+
+    return {
+        "q": q,
+        "offset": offset,
+        "has_more": len(products) > limit,
+        "products": [
+            {
+                "key": product.key,
+                "category_key": product.category_key,
+                "title": product.title,
+                "title_highlight": product.title_highlight,
+                "snippet": product.snippet,
+                "image_url": product.image_url,
+                "image_width": product.image_width,
+                "image_height": product.image_height,
+                "image_placeholder": product.image_placeholder,
+                "rank": product.rank,
+            }
+            for product in products[:limit]
+        ],
+        "categories": [
+            {
+                "key": category.key,
+                "title": category.title,
+                "title_highlight": category.title_highlight,
+                "snippet": category.snippet,
+                "rank": category.rank,
+            }
+            for category in categories
+        ],
+    }
@@ -0,0 +1,72 @@
+"""Compare the old per-request JSON encoding of the catalog with pre-rendered payloads.
+
+Run with: python -m app.benchmarks.catalog_payload [--categories 10] [--products 40] [--requests 500]
+"""
+import argparse
+import time
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.payloads import payload_response, render_payload
+
+
+def synthetic_catalog(categories: int, products: int) -> dict:
+    description = "Hyaluronic acid filler for natural volume and hydration. " * 12
+    return {
+        "categories": [
+            {
+                "id": c,
+                "key": f"category{c}",
+                "title": f"Category {c}",
+                "intro": "Intro text " * 10,
+                "references": [f"Reference {r}" for r in range(5)],
+                "products": [
+                    {
+                        "id": c * products + p,
+                        "key": f"product-{c}-{p}",
+                        "title": f"Product {p}",
+                        "description": description,
+                        "image_url": f"https://cdn.example.com/products/{c}-{p}.webp",
+                    }
+                    for p in range(products)
+                ],
+            }
+            for c in range(categories)
+        ]
+    }
+
+
+def measure(label: str, handler, requests: int):
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    sent = 0
+    for _ in range(requests):
+        sent += len(handler().body)
+    cpu = time.process_time() - start_cpu
+    wall = time.perf_counter() - start_wall
+    print(
+        f"{label:<28} {sent // requests:>9} B/resp "
+        f"{cpu / requests * 1e6:>10.1f} µs CPU/req "
+        f"{sent / wall / 1e6:>10.1f} MB/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--products", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    catalog = synthetic_catalog(args.categories, args.products)
+
+    start = time.perf_counter()
+    bodies = render_payload(catalog)
+    print(f"One-off render (orjson + gzip + br): {(time.perf_counter() - start) * 1e3:.1f} ms\n")
+
+    measure("current: jsonable_encoder", lambda: JSONResponse(jsonable_encoder(catalog)), args.requests)
+    for accept in ("identity", "gzip", "br, gzip"):
+        measure(f"pre-rendered: {accept}", lambda: payload_response(bodies, accept), args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare the old joinedload category tree with the json_agg query used by list_categories.
+
+Seeds a synthetic catalog into a scratch schema, which is dropped afterwards:
+
+    python -m app.benchmarks.category_tree --database-url postgresql://localhost/elegant_bench
+"""
+import argparse
+import statistics
+import time
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, joinedload
+from app.api.categorymanager import category_to_dict, category_tree_query
+from app.benchmarks.seed import seed_catalog
+from app.database import Base
+from app.models.admin import Category, Product
+
+SCHEMA = "bench_category_tree"
+
+
+def joinedload_tree(db: Session):
+    categories = db.query(Category).options(
+        joinedload(Category.translations),
+        joinedload(Category.products).joinedload(Product.translations),
+    ).all()
+    return [
+        {
+            "id": c.id,
+            "translations": [t.title for t in c.translations],
+            "products": [{"id": p.id, "translations": [t.title for t in p.translations]} for p in c.products],
+        }
+        for c in categories
+    ]
+
+
+def json_agg_tree(db: Session):
+    return [category_to_dict(row) for row in db.execute(category_tree_query()).all()]
+
+
+def measure(label: str, engine, load, runs: int):
+    rows = 0
+
+    def count_rows(conn, cursor, statement, parameters, context, executemany):
+        nonlocal rows
+        rows += max(cursor.rowcount, 0)
+
+    event.listen(engine, "after_cursor_execute", count_rows)
+    timings = []
+    try:
+        for _ in range(runs):
+            with Session(engine) as db:
+                start = time.perf_counter()
+                load(db)
+                timings.append(time.perf_counter() - start)
+    finally:
+        event.remove(engine, "after_cursor_execute", count_rows)
+    print(
+        f"{label:<12} {rows // runs:>9} rows/request "
+        f"median {statistics.median(timings) * 1e3:>8.1f} ms  "
+        f"max {max(timings) * 1e3:>8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True, help="scratch database to seed (not production)")
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--products", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url).execution_options(schema_translate_map={None: SCHEMA})
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    try:
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            seed_catalog(conn, args.categories, args.products)
+            conn.execute(text("ANALYZE"))
+        print(f"Seeded {args.categories} categories × {args.products} products\n")
+
+        measure("joinedload", engine, joinedload_tree, args.runs)
+        measure("json_agg", engine, json_agg_tree, args.runs)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
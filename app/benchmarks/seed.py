@@ -0,0 +1,35 @@
+"""Synthetic catalog data for benchmarks and query checks."""
+from sqlalchemy import insert
+from app.config import SUPPORTED_LANGUAGES
+from app.models.admin import Category, CategoryTranslation, Product, ProductTranslation
+
+
+def seed_catalog(conn, categories: int = 20, products: int = 50, languages=SUPPORTED_LANGUAGES):
+    """Insert categories × products, each translated into every language."""
+    description = "Hyaluronic acid filler for natural volume and hydration. " * 12
+    category_ids = conn.execute(
+        insert(Category).returning(Category.id),
+        [
+            {"key": f"bench-category-{c}", "references_json": [f"Reference {r}" for r in range(5)]}
+            for c in range(categories)
+        ],
+    ).scalars().all()
+    conn.execute(insert(CategoryTranslation), [
+        {"category_id": category_id, "language_code": lang, "title": f"Category {category_id} {lang}", "intro": "Intro"}
+        for category_id in category_ids
+        for lang in languages
+    ])
+    product_ids = conn.execute(
+        insert(Product).returning(Product.id),
+        [
+            {"category_id": category_id, "key": f"bench-product-{category_id}-{p}", "image_url": f"/static/products/{p}.png"}
+            for category_id in category_ids
+            for p in range(products)
+        ],
+    ).scalars().all()
+    conn.execute(insert(ProductTranslation), [
+        {"product_id": product_id, "language_code": lang, "title": f"Product {product_id} {lang}", "description": description}
+        for product_id in product_ids
+        for lang in languages
+    ])
+    return category_ids, product_ids
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import time
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.config import CATALOG_CACHE_CONTROL, CATALOG_VERSION_POLL_SECONDS, SUPPORTED_LANGUAGES
+from app.languages import language_chain
+from app.models.admin import CatalogState
+from app.payloads import render_payload
+
+# Public catalog snapshots, one per language chain: {(language_code, *fallbacks):
+# (version, bodies)}, where bodies are the rendered JSON bytes and their
+# pre-compressed variants. The chains a language has without Accept-Language
+# (the configured LANGUAGE_FALLBACKS one, and the language alone for
+# fallback=false) are always kept, at most two per language. Chains built from
+# a client's Accept-Language go in a small LRU instead, so the common browser
+# chains are served pre-compressed too but an odd one never displaces a
+# configured snapshot.
+# Every admin write bumps catalog_state.version in the same transaction, and each
+# worker re-reads that version at most every CATALOG_VERSION_POLL_SECONDS, so
+# edits made through any worker show up everywhere without a DB hit per request.
+_snapshots = {}
+_build_locks = {}  # one per snapshot key, so a slow build only holds up its own key
+ACCEPT_LANGUAGE_SNAPSHOTS = 32
+_accept_language_snapshots = OrderedDict()
+_lru_lock = threading.Lock()
+
+_known_version = None
+_checked_at = 0.0
+
+
+def _expire_known_version(session=None):
+    global _checked_at
+    _checked_at = 0.0
+
+
+def bump_catalog_version(db: Session) -> int:
+    """Mark the catalog as changed. Call inside the transaction that writes it."""
+    stmt = (
+        insert(CatalogState)
+        .values(id=1, version=1)
+        .on_conflict_do_update(
+            index_elements=[CatalogState.id],
+            set_={"version": CatalogState.version + 1},
+        )
+        .returning(CatalogState.version)
+    )
+    version = db.execute(stmt).scalar_one()
+    # This worker picks the new version up as soon as the write commits
+    event.listen(db, "after_commit", _expire_known_version, once=True)
+    return version
+
+
+def current_catalog_version(db: Session) -> int:
+    global _known_version, _checked_at
+    now = time.monotonic()
+    if _known_version is None or now - _checked_at >= CATALOG_VERSION_POLL_SECONDS:
+        _known_version = db.execute(
+            select(CatalogState.version).where(CatalogState.id == 1)
+        ).scalar() or 0
+        _checked_at = now
+    return _known_version
+
+
+def _get_cached(key: tuple, pinned: bool, version: int):
+    if pinned:
+        cached = _snapshots.get(key)
+    else:
+        with _lru_lock:
+            cached = _accept_language_snapshots.get(key)
+            if cached:
+                _accept_language_snapshots.move_to_end(key)
+    return cached if cached and cached[0] == version else None
+
+
+def _store(key: tuple, pinned: bool, snapshot: tuple):
+    if pinned:
+        _snapshots[key] = snapshot
+        return
+    with _lru_lock:
+        _accept_language_snapshots[key] = snapshot
+        _accept_language_snapshots.move_to_end(key)
+        while len(_accept_language_snapshots) > ACCEPT_LANGUAGE_SNAPSHOTS:
+            evicted, _ = _accept_language_snapshots.popitem(last=False)
+            _build_locks.pop(evicted, None)
+
+
+def get_catalog_snapshot(db: Session, languages: list, build):
+    """Return (version, bodies) for a language chain, calling build(db, languages) when stale."""
+    version = current_catalog_version(db)
+    lang = languages[0]
+    if lang not in SUPPORTED_LANGUAGES:
+        return version, render_payload(build(db, languages), compress=False)
+
+    configured = language_chain(lang)
+    key = tuple(languages)
+    pinned = languages in ([lang], configured)
+    cached = _get_cached(key, pinned, version)
+    if cached:
+        return cached
+
+    # Rebuild once; concurrent requests for the same snapshot wait for it
+    with _build_locks.setdefault(key, threading.Lock()):
+        cached = _get_cached(key, pinned, version)
+        if cached:
+            return cached
+        # The slowest brotli level only pays off on the snapshot most clients get
+        bodies = render_payload(build(db, languages), fast=languages != configured)
+        _store(key, pinned, (version, bodies))
+        return version, bodies
+
+
+def catalog_etag(version: int, *parts) -> str:
+    """ETag for a catalog response at a given version.
+
+    Weak, because the identity, gzip and br bodies share it: a strong
+    validator would have to differ between content-codings.
+    """
+    digest = hashlib.blake2b(repr((version,) + parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def catalog_cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL, "Vary": "Accept-Encoding, Accept-Language"}
@@ -7,3 +7,32 @@ BREVO_CONFIG = {
     "api_key": os.getenv("BREVO_API_KEY"),
     "to_email": os.getenv("TO_EMAIL"),
 }
+
+# Languages the storefront is translated into
+SUPPORTED_LANGUAGES = ["en", "fr", "nl", "pt", "ar", "de", "es"]
+DEFAULT_LANGUAGE = os.getenv("DEFAULT_LANGUAGE", "en")
+
+# Where public endpoints look when a translation is missing, tried in order
+# before DEFAULT_LANGUAGE. Format: "pt:es,en;nl:de,en"
+LANGUAGE_FALLBACKS = {
+    lang.strip(): [f.strip() for f in chain.split(",") if f.strip()]
+    for lang, _, chain in (
+        entry.partition(":") for entry in os.getenv("LANGUAGE_FALLBACKS", "").split(";") if entry.strip()
+    )
+}
+
+# How often each worker re-reads the catalog version from Postgres
+CATALOG_VERSION_POLL_SECONDS = float(os.getenv("CATALOG_VERSION_POLL_SECONDS", "2"))
+
+# Browser/CDN caching for public catalog responses (revalidated with ETags)
+CATALOG_CACHE_CONTROL = os.getenv(
+    "CATALOG_CACHE_CONTROL", "public, max-age=30, stale-while-revalidate=600"
+)
+
+# SQL instrumentation (app/database.py): statements slower than this are logged
+# with their route; a request running the same statement shape more than
+# N_PLUS_ONE_THRESHOLD times is flagged as a likely N+1. SQL_DEBUG adds
+# per-request statement counts to the logs and to X-SQL-* response headers.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+SQL_DEBUG = os.getenv("SQL_DEBUG", "").lower() in ("1", "true", "yes")
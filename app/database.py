@@ -1,6 +1,10 @@
 import os
-from sqlalchemy import create_engine, text
+import re
+import time
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import declarative_base, sessionmaker
+from app.config import SLOW_QUERY_MS
+from app.metrics import current_request_stats, sql_log
 
 # ✅ Use environment variable from Render (DATABASE_URL)
 DATABASE_URL = os.getenv(
@@ -15,6 +19,52 @@ engine = create_engine(
     pool_size=5,            # Adjust as needed
     max_overflow=10,        # Allows short spikes in load
 )
+
+# --------------------
+# Statement instrumentation
+# --------------------
+# Every statement adds to the current request's RequestStats (app/metrics.py):
+# DB time and count for /metrics and Server-Timing, and its shape for N+1
+# detection at the end of the request. Statements slower than SLOW_QUERY_MS
+# are logged with the route that ran them.
+_PLACEHOLDER = re.compile(r"%\(\w+\)s")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with parameters and IN-list lengths folded, so repeats of one query compare equal."""
+    shape = _PLACEHOLDER_LIST.sub("?", _PLACEHOLDER.sub("?", statement))
+    return " ".join(shape.split())
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _stop_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["statement_started"].pop()
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.db_seconds += elapsed
+        stats.statements += 1
+        stats.shapes[statement_shape(statement)] += 1
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        sql_log.warning(
+            "Slow query (%.0f ms) on %s: %s",
+            elapsed * 1000, stats.request_label if stats is not None else "no request", " ".join(statement.split())[:2000],
+        )
+
+
+@event.listens_for(engine, "handle_error")
+def _drop_statement_timer(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    started = exception_context.connection.info.get("statement_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
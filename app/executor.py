@@ -0,0 +1,19 @@
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Async endpoints hand their blocking SQLAlchemy and boto3 work to this pool so
+# a slow upload never stalls the event loop. It is kept small so a burst of
+# uploads can't take every connection from the DB pool.
+BLOCKING_WORKERS = int(os.getenv("BLOCKING_WORKERS", "4"))
+
+blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="blocking")
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run func(*args, **kwargs) on the blocking pool, keeping the caller's contextvars."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(blocking_executor, call)
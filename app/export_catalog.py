@@ -0,0 +1,165 @@
+"""Stream the catalog out as NDJSON or CSV.
+
+Rows are read through server-side cursors (yield_per), so memory stays flat
+however large the catalog is. Both formats load back with app.import_from_json.
+
+    python -m app.export_catalog [--format ndjson|csv] [--language fr] [-o catalog.ndjson]
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from itertools import groupby
+from sqlalchemy import and_, select, true
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.admin import Category, CategoryTranslation, Product, ProductTranslation
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# One CSV row per translation; category/product fields repeat on each row.
+# Categories and products without a translation get one row with an empty language_code.
+CSV_COLUMNS = [
+    "type", "category", "key", "language_code", "title", "text",
+    "references", "image_url", "image_width", "image_height", "image_placeholder", "image_variants",
+]
+PRODUCT_FIELDS = ["image_url", "image_width", "image_height", "image_placeholder", "image_variants"]
+
+
+def _translation_filter(model, language_code):
+    return model.language_code == language_code if language_code else true()
+
+
+def export_records(db: Session, language_code=None):
+    """Yield one dict per category, then one per product, with their translations."""
+    categories = db.execute(
+        select(
+            Category.id,
+            Category.key,
+            Category.references_json,
+            CategoryTranslation.language_code,
+            CategoryTranslation.title,
+            CategoryTranslation.intro,
+        )
+        .outerjoin(
+            CategoryTranslation,
+            and_(
+                CategoryTranslation.category_id == Category.id,
+                _translation_filter(CategoryTranslation, language_code),
+            ),
+        )
+        .order_by(Category.id, CategoryTranslation.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for _, rows in groupby(categories, key=lambda row: row.id):
+        rows = list(rows)
+        yield {
+            "type": "category",
+            "key": rows[0].key,
+            "references": rows[0].references_json or [],
+            "translations": [
+                {"language_code": row.language_code, "title": row.title, "intro": row.intro}
+                for row in rows
+                if row.language_code is not None
+            ],
+        }
+
+    products = db.execute(
+        select(
+            Product.id,
+            Category.key.label("category_key"),
+            Product.key,
+            *[getattr(Product, field) for field in PRODUCT_FIELDS],
+            ProductTranslation.language_code,
+            ProductTranslation.title,
+            ProductTranslation.description,
+        )
+        .join(Category, Category.id == Product.category_id)
+        .outerjoin(
+            ProductTranslation,
+            and_(
+                ProductTranslation.product_id == Product.id,
+                _translation_filter(ProductTranslation, language_code),
+            ),
+        )
+        .order_by(Product.id, ProductTranslation.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for _, rows in groupby(products, key=lambda row: row.id):
+        rows = list(rows)
+        yield {
+            "type": "product",
+            "category": rows[0].category_key,
+            "key": rows[0].key,
+            **{field: getattr(rows[0], field) for field in PRODUCT_FIELDS},
+            "translations": [
+                {"language_code": row.language_code, "title": row.title, "description": row.description}
+                for row in rows
+                if row.language_code is not None
+            ],
+        }
+
+
+def ndjson_lines(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def csv_lines(records):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    writer.writeheader()
+    yield flush()
+    for record in records:
+        base = {"type": record["type"], "key": record["key"]}
+        if record["type"] == "category":
+            base["references"] = json.dumps(record["references"], ensure_ascii=False)
+            text_field = "intro"
+        else:
+            base["category"] = record["category"]
+            base.update({field: record[field] for field in PRODUCT_FIELDS})
+            base["image_variants"] = json.dumps(record["image_variants"]) if record["image_variants"] is not None else None
+            text_field = "description"
+        for translation in record["translations"] or [{}]:
+            writer.writerow({
+                **base,
+                "language_code": translation.get("language_code"),
+                "title": translation.get("title"),
+                "text": translation.get(text_field),
+            })
+        yield flush()
+
+
+def stream_export(fmt: str, language_code=None):
+    """Export lines on a session of their own, for streaming responses."""
+    db = SessionLocal()
+    try:
+        records = export_records(db, language_code)
+        yield from (csv_lines(records) if fmt == "csv" else ndjson_lines(records))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the catalog as NDJSON or CSV")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--language", help="only export translations in this language")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        for line in stream_export(args.format, args.language):
+            out.write(line)
+    finally:
+        if args.output:
+            out.close()
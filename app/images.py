@@ -0,0 +1,189 @@
+"""Responsive image derivatives for product photos.
+
+After an upload, a process pool worker fetches the original from R2 (or
+app/static for legacy /static paths), resizes it to a fixed set of widths in
+WebP and AVIF and uploads the variants next to the original, so the image
+bytes never pass through the API worker. Width, height, a tiny blurred
+placeholder and the variant URLs are stored on Product. An image that can't
+be processed (stored elsewhere, missing, or not decodable) gets
+image_variants = [], so it isn't retried until the product's image changes.
+
+Backfill existing products with: python -m app.images backfill [--force]
+"""
+import argparse
+import base64
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from PIL import Image, ImageOps, features
+from app.catalog_cache import bump_catalog_version
+from app.database import SessionLocal
+from app.models.admin import Product
+from app.r2_client import new_r2_client, r2, R2_BUCKET_NAME, object_key, public_url
+from app.r2_cleanup import queue_image_deletion
+
+VARIANT_WIDTHS = (320, 640, 1024, 1600)
+VARIANT_FORMATS = ("avif", "webp") if features.check("avif") else ("webp",)
+VARIANT_QUALITY = {"avif": 50, "webp": 75}
+PLACEHOLDER_WIDTH = 16
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+_pool = None
+
+
+class UnprocessableImage(Exception):
+    """The original can't be read or decoded; trying again won't help."""
+
+
+def _start_worker():
+    # A forked worker would share the parent's R2 connections
+    global r2
+    r2 = new_r2_client()
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS, initializer=_start_worker)
+    return _pool
+
+
+def render_variants(data: bytes) -> dict:
+    """Decode an image and encode every derivative. CPU-bound."""
+    try:
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise UnprocessableImage(f"cannot decode image: {e}")
+    width, height = image.size
+
+    widths = [w for w in VARIANT_WIDTHS if w < width] + [min(width, VARIANT_WIDTHS[-1])]
+    variants = []
+    for w in sorted(set(widths)):
+        resized = image if w == width else image.resize((w, round(height * w / width)), Image.LANCZOS)
+        for fmt in VARIANT_FORMATS:
+            out = io.BytesIO()
+            resized.save(out, format=fmt.upper(), quality=VARIANT_QUALITY[fmt])
+            variants.append((w, fmt, out.getvalue()))
+
+    tiny = image.resize((PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))))
+    out = io.BytesIO()
+    tiny.save(out, format="WEBP", quality=30)
+    placeholder = "data:image/webp;base64," + base64.b64encode(out.getvalue()).decode()
+
+    return {"width": width, "height": height, "placeholder": placeholder, "variants": variants}
+
+
+def _read_original(image_url: str):
+    """Return (key used to name the variants, original bytes)."""
+    key = object_key(image_url)
+    if key:
+        try:
+            return key, r2.get_object(Bucket=R2_BUCKET_NAME, Key=key)["Body"].read()
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                raise UnprocessableImage(f"not on R2: {key}")
+            raise
+    if image_url.startswith("/static/"):
+        path = os.path.join(STATIC_DIR, image_url[len("/static/"):])
+        try:
+            with open(path, "rb") as f:
+                return image_url[len("/static/"):], f.read()
+        except FileNotFoundError:
+            raise UnprocessableImage(f"no such file: {path}")
+    raise UnprocessableImage(f"unsupported image location: {image_url}")
+
+
+def _variant_key(original_key: str, width: int, fmt: str) -> str:
+    directory, filename = os.path.split(original_key)
+    stem = os.path.splitext(filename)[0]
+    return f"{directory}/variants/{stem}-{width}.{fmt}"
+
+
+def render_product_image(image_url: str) -> dict:
+    """Fetch an original, render its derivatives and upload them; returns the fields Product stores.
+
+    Runs in the process pool. Only the URL goes in and the variant URLs come
+    back, so the API worker never holds the image bytes.
+    """
+    original_key, data = _read_original(image_url)
+    rendered = render_variants(data)
+    variants = []
+    for width, fmt, body in rendered["variants"]:
+        key = _variant_key(original_key, width, fmt)
+        r2.put_object(
+            Bucket=R2_BUCKET_NAME,
+            Key=key,
+            Body=body,
+            ContentType=f"image/{fmt}",
+            CacheControl="public, max-age=31536000, immutable",
+        )
+        variants.append({"url": public_url(key), "width": width, "format": fmt})
+    return {**rendered, "variants": variants}
+
+
+def generate_product_images(product_id: int):
+    """Build and upload derivatives for a product's current image. Blocking."""
+    db = SessionLocal()
+    try:
+        product = db.query(Product).filter(Product.id == product_id).first()
+        if not product or not product.image_url:
+            return
+        image_url = product.image_url
+        # Nothing to keep open while the pool works
+        db.rollback()
+        try:
+            rendered = _process_pool().submit(render_product_image, image_url).result()
+        except UnprocessableImage as e:
+            print(f"❌ Image variants failed for product {product_id}:", e)
+            # Recorded, so updates don't queue the same image again; a new image_url resets it
+            db.query(Product).filter(Product.id == product_id, Product.image_url == image_url).update(
+                {Product.image_variants: []}, synchronize_session=False
+            )
+            db.commit()
+            return
+
+        # The image may have been replaced while we were working
+        db.refresh(product)
+        if product.image_url != image_url:
+            queue_image_deletion(db, [(image_url, rendered["variants"])])
+            db.commit()
+            return
+        product.image_width = rendered["width"]
+        product.image_height = rendered["height"]
+        product.image_placeholder = rendered["placeholder"]
+        product.image_variants = rendered["variants"]
+        bump_catalog_version(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Image variants failed for product {product_id}:", e)
+    finally:
+        db.close()
+
+
+def backfill(force: bool = False):
+    db = SessionLocal()
+    try:
+        query = db.query(Product.id, Product.key).filter(Product.image_url.isnot(None))
+        if not force:
+            query = query.filter(Product.image_variants.is_(None))
+        products = query.order_by(Product.id).all()
+    finally:
+        db.close()
+
+    # Each thread feeds the process pool, so IMAGE_WORKERS images render at once
+    with ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as threads:
+        for product, _ in zip(products, threads.map(generate_product_images, [p.id for p in products])):
+            print(f"Processed {product.key}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Product image derivatives")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--force", action="store_true", help="regenerate products that already have variants")
+    args = parser.parse_args()
+    backfill(force=args.force)
@@ -0,0 +1,45 @@
+from typing import Optional
+from app.config import DEFAULT_LANGUAGE, LANGUAGE_FALLBACKS, SUPPORTED_LANGUAGES
+
+
+def parse_accept_language(header: Optional[str]) -> list:
+    """Primary language subtags from an Accept-Language header, best first."""
+    if not header:
+        return []
+    weighted = []
+    for position, part in enumerate(header.split(",")):
+        tag, _, params = part.strip().partition(";")
+        tag = tag.strip().lower().split("-")[0]
+        if not tag or tag == "*":
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            weighted.append((-quality, position, tag))
+    return [tag for _, _, tag in sorted(weighted)]
+
+
+def language_chain(language_code: str, accept_language: Optional[str] = None, fallback: bool = True) -> list:
+    """Languages to read translations from, in order; the requested one always comes first.
+
+    After it come the Accept-Language preferences, the configured
+    LANGUAGE_FALLBACKS for the language, then DEFAULT_LANGUAGE. The chain
+    ends at DEFAULT_LANGUAGE, the catalog's language of last resort, so
+    Accept-Language chains that only differ after it resolve the same way.
+    """
+    chain = [language_code]
+    if not fallback:
+        return chain
+    candidates = parse_accept_language(accept_language) + LANGUAGE_FALLBACKS.get(language_code, []) + [DEFAULT_LANGUAGE]
+    for lang in candidates:
+        if DEFAULT_LANGUAGE in chain:
+            break
+        if lang in SUPPORTED_LANGUAGES and lang not in chain:
+            chain.append(lang)
+    return chain
@@ -1,11 +1,13 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.api import contact, admin as admin_api, get_data_from_database, categorymanager, adminproducts
+from app.api import contact, admin as admin_api, get_data_from_database, categorymanager, adminproducts, catalogtransfer
 from app.models import admin as admin_model
 from app.database import Base, engine
+from app.metrics import METRICS_TOKEN, MetricsMiddleware, render_metrics
 import os
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 Base.metadata.create_all(bind=engine)
 
@@ -27,8 +29,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # admin list pagination, timings, SQL_DEBUG counts
+    expose_headers=["X-Next-After-Id", "X-Total-Count", "Server-Timing", "X-SQL-Statements", "X-SQL-Time-Ms", "X-SQL-Max-Repeats"],
 )
 
+# Compress other JSON responses; pre-compressed catalog payloads pass through untouched
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+
+# Outermost, so timings include CORS and compression
+app.add_middleware(MetricsMiddleware)
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 STATIC_DIR = os.path.join(BASE_DIR, "static")
 
@@ -39,6 +49,7 @@ app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 app.include_router(adminproducts.router, prefix="/api/admin/products", tags=["admin_products"])
 app.include_router(get_data_from_database.router, prefix="/api/products", tags=["public_products"])
 app.include_router(categorymanager.router, prefix="/api/admin/categories", tags=["admin_categories"])
+app.include_router(catalogtransfer.router, prefix="/api/admin/catalog", tags=["admin_catalog"])
 app.include_router(contact.router, prefix="/api", tags=["contact"])
 app.include_router(admin_api.router, prefix="/api/admin", tags=["admin"])
 
@@ -48,4 +59,10 @@ def read_root():
 
 @app.api_route("/ping", methods=["GET", "HEAD"])
 def ping():
-    return JSONResponse(content={"status": "ok"})
\ No newline at end of file
+    return JSONResponse(content={"status": "ok"})
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(authorization: str = Header(None)):
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,218 @@
+"""Request metrics in Prometheus text format, and Server-Timing headers.
+
+MetricsMiddleware times every HTTP request and labels it with the route
+template (/api/products/{language_code}, not the raw path), so the series
+stay bounded. Database time comes from the cursor hooks in app/database.py
+and serialisation time from timed("serialize") blocks; both are collected
+per request in a RequestStats held in a context variable, which FastAPI
+carries into the threadpool that runs sync endpoints.
+
+Each worker process keeps its own counters; Prometheus sums them when it
+scrapes every worker. The endpoint is GET /metrics (see app/main.py).
+"""
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from starlette.datastructures import MutableHeaders
+from app.config import N_PLUS_ONE_THRESHOLD, SQL_DEBUG
+
+sql_log = logging.getLogger("app.sql")
+if SQL_DEBUG:
+    sql_log.setLevel(logging.INFO)
+    if not logging.getLogger().handlers:  # uvicorn only configures its own loggers
+        sql_log.addHandler(logging.StreamHandler())
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # when set, /metrics requires "Authorization: Bearer <token>"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+
+class RequestStats:
+    __slots__ = ("scope", "db_seconds", "serialize_seconds", "statements", "shapes")
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.statements = 0
+        self.shapes = Counter()  # statement shape -> executions, see app.database.statement_shape
+
+    @property
+    def request_label(self) -> str:
+        return f"{self.scope['method']} {route_label(self.scope)}" if self.scope is not None else "-"
+
+    def repeated(self, threshold: int) -> list:
+        """(shape, count) for statement shapes executed more than threshold times, most first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+current_request_stats: ContextVar = ContextVar("current_request_stats", default=None)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the block's duration to the current request's <phase>_seconds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = current_request_stats.get()
+        if stats is not None:
+            setattr(stats, f"{phase}_seconds", getattr(stats, f"{phase}_seconds") + time.perf_counter() - start)
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple, buckets=LATENCY_BUCKETS):
+        self.name, self.help_text, self.labels, self.buckets = name, help_text, labels, buckets
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label_values: tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            labels = _labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {values[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help_text: str):
+        self.name, self.help_text = name, help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def add(self, amount: int):
+        with self._lock:
+            self.value += amount
+
+    def render(self) -> list:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {self.value}"]
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    escape = lambda value: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time until the response is fully sent.", ("method", "route", "status")
+)
+DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in database statements per request.", ("method", "route")
+)
+SERIALIZE_SECONDS = Histogram(
+    "http_request_serialize_seconds", "Time spent rendering response bodies per request.", ("method", "route")
+)
+DB_STATEMENTS = Histogram(
+    "http_request_db_statements", "SQL statements executed per request.", ("method", "route"), STATEMENT_BUCKETS
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled by this worker.")
+METRICS = [REQUEST_SECONDS, DB_SECONDS, DB_STATEMENTS, SERIALIZE_SECONDS, IN_FLIGHT]
+
+
+def route_label(scope) -> str:
+    """Route template the request matched; raw paths would give unbounded series."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    return "static" if scope.get("root_path", "").endswith("/static") else "unmatched"
+
+
+def server_timing(stats: RequestStats, total: float) -> str:
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} statements", '
+        f"serialize;dur={stats.serialize_seconds * 1000:.1f}, "
+        f"total;dur={total * 1000:.1f}"
+    )
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: no per-request task or body buffering, so streaming responses stay streaming."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+        finished = False
+
+        def finish():
+            # Once the last body chunk is out the response is done; background
+            # tasks Starlette runs afterwards count toward neither its latency
+            # nor its SQL
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            IN_FLIGHT.add(-1)
+            route = route_label(scope)
+            REQUEST_SECONDS.observe((scope["method"], route, str(status)), time.perf_counter() - start)
+            DB_SECONDS.observe((scope["method"], route), stats.db_seconds)
+            DB_STATEMENTS.observe((scope["method"], route), stats.statements)
+            SERIALIZE_SECONDS.observe((scope["method"], route), stats.serialize_seconds)
+            log_request_sql(scope["method"], route, stats)
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(stats, time.perf_counter() - start))
+                if SQL_DEBUG:
+                    # Counts so far: a streaming body may run more statements after this
+                    headers["X-SQL-Statements"] = str(stats.statements)
+                    headers["X-SQL-Time-Ms"] = f"{stats.db_seconds * 1000:.1f}"
+                    headers["X-SQL-Max-Repeats"] = str(max(stats.shapes.values(), default=0))
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        IN_FLIGHT.add(1)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # Still unfinished if the app raised or never sent a body
+            finish()
+            current_request_stats.reset(token)
+
+
+def log_request_sql(method: str, route: str, stats: RequestStats):
+    for shape, count in stats.repeated(N_PLUS_ONE_THRESHOLD):
+        sql_log.warning("Possible N+1 on %s %s: %d× %s", method, route, count, shape[:500])
+    if SQL_DEBUG:
+        sql_log.info(
+            "%s %s: %d statements (%d distinct), %.1f ms in the database",
+            method, route, stats.statements, len(stats.shapes), stats.db_seconds * 1000,
+        )
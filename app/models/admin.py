@@ -1,8 +1,75 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Integer, BigInteger, String, DateTime, Text, ForeignKey, Index, DDL, event, func
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 from app.database import Base
 
+# Trigram indexes back the admin text filters (ILIKE '%...%')
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+# Full-text search for /api/products/{lang}/search. Each translation row is
+# stemmed with its own language's configuration; languages without one fall
+# back to "simple" (lowercased words, no stemming or stop words).
+TEXT_SEARCH_CONFIGS = {
+    "en": "english",
+    "fr": "french",
+    "nl": "dutch",
+    "pt": "portuguese",
+    "ar": "arabic",
+    "de": "german",
+    "es": "spanish",
+}
+
+
+def search_vector_sql(title: str, body: str) -> str:
+    """Generated-column expression: title weighted A, body weighted B."""
+    config = "CASE language_code %s ELSE 'simple'::regconfig END" % " ".join(
+        f"WHEN '{lang}' THEN '{name}'::regconfig" for lang, name in TEXT_SEARCH_CONFIGS.items()
+    )
+    return (
+        f"setweight(to_tsvector({config}, coalesce({title}, '')), 'A') || "
+        f"setweight(to_tsvector({config}, coalesce({body}, '')), 'B')"
+    )
+
+
+# Change tracking for /api/products/{lang}/changes. Triggers stamp every catalog
+# row with the id of the transaction that last wrote it, and record deletions
+# in catalog_tombstones. Transaction ids only grow, and every id below the
+# current snapshot's xmin belongs to a finished transaction, so "rows with
+# version >= since" plus xmin as the next since never skips a late commit.
+CHANGE_TRACKED_TABLES = ["categories", "category_translations", "products", "product_translations"]
+CHANGE_TRACKING_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION catalog_stamp_version() RETURNS trigger AS $$
+    BEGIN
+        NEW.version := pg_current_xact_id()::text::bigint;
+        NEW.updated_at := now();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION catalog_record_tombstone() RETURNS trigger AS $$
+    DECLARE
+        old_row jsonb := to_jsonb(OLD);
+    BEGIN
+        EXECUTE format(
+            'INSERT INTO %%I.catalog_tombstones (table_name, row_id, parent_id, language_code, version, deleted_at) '
+            'VALUES ($1, $2, $3, $4, pg_current_xact_id()::text::bigint, now())',
+            TG_TABLE_SCHEMA
+        ) USING
+            TG_TABLE_NAME,
+            OLD.id,
+            COALESCE(old_row->>'category_id', old_row->>'product_id')::integer,
+            old_row->>'language_code';
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+for statement in CHANGE_TRACKING_FUNCTIONS:
+    event.listen(Base.metadata, "before_create", DDL(statement))
+
 
 class Admin(Base):
     __tablename__ = "admins"
@@ -18,41 +85,124 @@ class Category(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     key = Column(String, unique=True, nullable=False)
-    references_json = Column(Text, nullable=True)  # store references as JSON string
+    references_json = Column(JSONB, nullable=True)  # list of references
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    version = Column(BigInteger, nullable=False, server_default="0")  # writing transaction id, see CHANGE_TRACKING_FUNCTIONS
+
+    translations = relationship("CategoryTranslation", back_populates="category", cascade="all, delete-orphan", passive_deletes=True)
+    products = relationship("Product", back_populates="category", cascade="all, delete-orphan", passive_deletes=True)
 
-    translations = relationship("CategoryTranslation", back_populates="category", cascade="all, delete-orphan")
-    products = relationship("Product", back_populates="category", cascade="all, delete-orphan")
+    __table_args__ = (
+        Index("ix_categories_key_trgm", "key", postgresql_using="gin", postgresql_ops={"key": "gin_trgm_ops"}),
+        Index("ix_categories_version", "version"),
+    )
 
 
 class CategoryTranslation(Base):
     __tablename__ = "category_translations"
     id = Column(Integer, primary_key=True, index=True)
-    category_id = Column(Integer, ForeignKey("categories.id"))
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
     language_code = Column(String, nullable=False)  # e.g., "en", "fr"
     title = Column(String, nullable=False)
     intro = Column(Text, nullable=True)
+    search_vector = deferred(Column(TSVECTOR, Computed(search_vector_sql("title", "intro"), persisted=True)))
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    version = Column(BigInteger, nullable=False, server_default="0")  # writing transaction id, see CHANGE_TRACKING_FUNCTIONS
 
     category = relationship("Category", back_populates="translations")
 
+    __table_args__ = (
+        Index("ix_category_translations_category_language", "category_id", "language_code", unique=True),
+        Index("ix_category_translations_language_category", "language_code", "category_id"),
+        Index("ix_category_translations_language_version", "language_code", "version"),
+        Index("ix_category_translations_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_category_translations_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 
 class Product(Base):
     __tablename__ = "products"
 
     id = Column(Integer, primary_key=True, index=True)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
     key = Column(String, nullable=False)  # NEW: stable key like "lips", "under-eye"
     image_url = Column(String, nullable=True)
+    image_width = Column(Integer, nullable=True)
+    image_height = Column(Integer, nullable=True)
+    image_placeholder = Column(Text, nullable=True)  # tiny blurred data: URI
+    image_variants = Column(JSONB, nullable=True)  # [{"url", "width", "format"}], see app/images.py
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    version = Column(BigInteger, nullable=False, server_default="0")  # writing transaction id, see CHANGE_TRACKING_FUNCTIONS
 
     category = relationship("Category", back_populates="products")
-    translations = relationship("ProductTranslation", back_populates="product", cascade="all, delete-orphan")
+    translations = relationship("ProductTranslation", back_populates="product", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_products_category_id_id", "category_id", "id"),
+        Index("ix_products_category_key", "category_id", "key", unique=True),
+        Index("ix_products_key", "key", unique=True, postgresql_ops={"key": "text_pattern_ops"}),  # = and LIKE 'prefix%'
+        Index("ix_products_key_trgm", "key", postgresql_using="gin", postgresql_ops={"key": "gin_trgm_ops"}),
+        Index("ix_products_version", "version"),
+    )
 
 
 class ProductTranslation(Base):
     __tablename__ = "product_translations"
     id = Column(Integer, primary_key=True, index=True)
-    product_id = Column(Integer, ForeignKey("products.id"))
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
     language_code = Column(String, nullable=False)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
+    search_vector = deferred(Column(TSVECTOR, Computed(search_vector_sql("title", "description"), persisted=True)))
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    version = Column(BigInteger, nullable=False, server_default="0")  # writing transaction id, see CHANGE_TRACKING_FUNCTIONS
 
     product = relationship("Product", back_populates="translations")
+
+    __table_args__ = (
+        Index("ix_product_translations_product_language", "product_id", "language_code", unique=True),
+        Index("ix_product_translations_language_product", "language_code", "product_id"),
+        Index("ix_product_translations_language_version", "language_code", "version"),
+        Index("ix_product_translations_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_product_translations_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+
+class CatalogState(Base):
+    __tablename__ = "catalog_state"
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)  # bumped on every catalog write
+
+
+class R2Deletion(Base):
+    __tablename__ = "r2_deletions"
+    id = Column(BigInteger, primary_key=True)
+    key = Column(String, unique=True, nullable=False)  # R2 object to remove
+    image_url = Column(String, nullable=False)  # product image it belonged to; kept while still in use
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class CatalogTombstone(Base):
+    __tablename__ = "catalog_tombstones"
+    id = Column(BigInteger, primary_key=True)
+    table_name = Column(String, nullable=False)  # one of CHANGE_TRACKED_TABLES
+    row_id = Column(Integer, nullable=False)
+    parent_id = Column(Integer, nullable=True)  # category_id / product_id of a translation or product
+    language_code = Column(String, nullable=True)
+    version = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_catalog_tombstones_table_version", "table_name", "version"),
+    )
+
+
+# Runs only when create_all actually creates the table
+for _table in CHANGE_TRACKED_TABLES:
+    for _statement in (
+        "CREATE TRIGGER %(table)s_stamp_version BEFORE INSERT OR UPDATE ON %(fullname)s "
+        "FOR EACH ROW EXECUTE FUNCTION catalog_stamp_version()",
+        "CREATE TRIGGER %(table)s_record_tombstone AFTER DELETE ON %(fullname)s "
+        "FOR EACH ROW EXECUTE FUNCTION catalog_record_tombstone()",
+    ):
+        event.listen(Base.metadata.tables[_table], "after_create", DDL(_statement))
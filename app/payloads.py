@@ -0,0 +1,55 @@
+import gzip
+import orjson
+from fastapi import Response
+from app.metrics import timed
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+def render_payload(data, compress: bool = True, fast: bool = False) -> dict:
+    """Serialise data once to JSON bytes, plus gzip/brotli variants keyed by content-coding.
+
+    fast trades a somewhat larger body for compression that takes milliseconds
+    rather than the best levels' hundreds on a full catalog.
+    """
+    with timed("serialize"):
+        body = orjson.dumps(data)
+        bodies = {"identity": body}
+        if compress:
+            bodies["gzip"] = gzip.compress(body, compresslevel=6 if fast else 9)
+            if brotli is not None:
+                bodies["br"] = brotli.compress(body, quality=5 if fast else 11)
+    return bodies
+
+
+def pick_encoding(accept_encoding, available) -> str:
+    """Choose the best pre-compressed variant the client accepts."""
+    if not accept_encoding:
+        return "identity"
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip()] = q
+    for coding in ("br", "gzip"):
+        if coding in available and accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return "identity"
+
+
+def payload_response(bodies: dict, accept_encoding=None, headers=None) -> Response:
+    """Serve a rendered payload as raw bytes, without re-encoding per request."""
+    encoding = pick_encoding(accept_encoding, bodies)
+    response_headers = {"Vary": "Accept-Encoding", **(headers or {})}
+    if encoding != "identity":
+        response_headers["Content-Encoding"] = encoding
+    return Response(content=bodies[encoding], media_type="application/json", headers=response_headers)
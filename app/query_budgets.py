@@ -0,0 +1,27 @@
+"""SQL budgets declared next to each route.
+
+    @router.get("/{language_code}")
+    @query_budget(statements=4, rows=30)
+    def get_products(...):
+
+A budget is the most statements a request may execute and the most rows it
+may read back, measured against the synthetic catalog tests/conftest.py seeds
+(BUDGET_CATEGORIES categories × BUDGET_PRODUCTS products, every language).
+tests/test_route_budgets.py exercises every route in app/api and fails when
+one goes over, or has no budget, so a new lazy load or N+1 fails the test run
+next to the route that caused it.
+"""
+from typing import NamedTuple
+
+
+class QueryBudget(NamedTuple):
+    statements: int
+    rows: int
+
+
+def query_budget(statements: int, rows: int):
+    """Attach a QueryBudget to a route function; goes below the @router decorator."""
+    def decorate(endpoint):
+        endpoint.query_budget = QueryBudget(statements, rows)
+        return endpoint
+    return decorate
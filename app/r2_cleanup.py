@@ -0,0 +1,80 @@
+"""Remove R2 objects that belonged to deleted or replaced product images.
+
+Deleting a product (or swapping its image) queues the original and its
+variants in r2_deletions in the same transaction. The queue is drained after
+the request by a background task, 1000 keys per delete_objects call, and
+whatever is left after a failure is retried on the next run:
+
+    python -m app.r2_cleanup
+"""
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.admin import Product, R2Deletion
+from app.r2_client import r2, R2_BUCKET_NAME, object_key
+
+R2_DELETE_BATCH_SIZE = 1000  # delete_objects limit
+
+
+def queue_image_deletion(db: Session, images):
+    """Queue the R2 objects of (image_url, image_variants) pairs; images outside R2 are skipped."""
+    rows = []
+    for image_url, variants in images:
+        if not image_url:
+            continue
+        urls = [image_url] + [variant["url"] for variant in variants or []]
+        rows.extend({"key": key, "image_url": image_url} for key in map(object_key, urls) if key)
+    if rows:
+        db.execute(insert(R2Deletion).on_conflict_do_nothing(index_elements=[R2Deletion.key]), rows)
+
+
+def drain_r2_deletions(batch_size: int = R2_DELETE_BATCH_SIZE) -> int:
+    """Delete queued objects from R2 in batches; returns how many were removed. Blocking."""
+    db = SessionLocal()
+    removed = 0
+    try:
+        while True:
+            batch = (
+                db.query(R2Deletion)
+                .order_by(R2Deletion.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not batch:
+                break
+
+            # Another product may point at the same image (existingImage); keep its objects
+            in_use = {
+                url for (url,) in db.query(Product.image_url)
+                .filter(Product.image_url.in_({row.image_url for row in batch}))
+            }
+            doomed = [row.key for row in batch if row.image_url not in in_use]
+
+            failed = set()
+            if doomed:
+                response = r2.delete_objects(
+                    Bucket=R2_BUCKET_NAME,
+                    Delete={"Objects": [{"Key": key} for key in doomed], "Quiet": True},
+                )
+                failed = {error["Key"] for error in response.get("Errors", [])}
+                for error in response.get("Errors", []):
+                    print(f"❌ R2 delete failed for {error['Key']}: {error.get('Message')}")
+
+            db.query(R2Deletion).filter(
+                R2Deletion.id.in_([row.id for row in batch if row.key not in failed])
+            ).delete(synchronize_session=False)
+            db.commit()
+            removed += len(doomed) - len(failed)
+            if failed:
+                break  # leave the rest for the next run
+    except Exception as e:
+        db.rollback()
+        print("❌ Draining R2 deletions failed:", e)
+    finally:
+        db.close()
+    return removed
+
+
+if __name__ == "__main__":
+    print(f"🗑️ Removed {drain_r2_deletions()} objects from R2")
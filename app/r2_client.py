@@ -1,11 +1,32 @@
 import boto3
 import os
 
+
+def new_r2_client():
+    """A Cloudflare R2 client. Each process needs its own; see app/images.py."""
+    return boto3.client(
+        's3',
+        endpoint_url=os.getenv("R2_ENDPOINT"),
+        aws_access_key_id=os.getenv("R2_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("R2_SECRET_ACCESS_KEY"),
+        region_name="auto",
+    )
+
+
 # Initialize Cloudflare R2 client
-r2 = boto3.client(
-    's3',
-    endpoint_url=os.getenv("R2_ENDPOINT"),
-    aws_access_key_id=os.getenv("R2_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("R2_SECRET_ACCESS_KEY"),
-    region_name="auto",
-)
+r2 = new_r2_client()
+
+R2_BUCKET_NAME = os.getenv("R2_BUCKET_NAME")
+R2_PUBLIC_URL = os.getenv("R2_PUBLIC_URL")
+
+
+def public_url(key: str) -> str:
+    return f"{R2_PUBLIC_URL}/{key}"
+
+
+def object_key(url: str):
+    """R2 object key for a public URL, or None if it is not stored on R2."""
+    prefix = f"{R2_PUBLIC_URL}/"
+    if R2_PUBLIC_URL and url.startswith(prefix):
+        return url[len(prefix):]
+    return None
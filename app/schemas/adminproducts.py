@@ -0,0 +1,41 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class ImageUploadRequest(BaseModel):
+    filename: str
+    content_type: str
+    size: int = Field(gt=0)  # bytes; large files get a multipart upload
+
+
+class ImageUploadPart(BaseModel):
+    part_number: int
+    etag: str
+
+
+class ImageUploadComplete(BaseModel):
+    key: str
+    upload_id: str
+    parts: List[ImageUploadPart]
+
+
+class ProductTranslationIn(BaseModel):
+    language_code: str
+    title: str = ""
+    description: str = ""
+
+
+class ProductTranslationPatch(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+
+
+class ProductBatchItem(BaseModel):
+    id: Optional[int] = None  # set to update an existing product
+    category_id: int
+    image_key: Optional[str] = None  # from /image-uploads
+    translations: List[ProductTranslationIn] = Field(min_length=1)
+
+
+class ProductBatch(BaseModel):
+    items: List[ProductBatchItem] = Field(min_length=1, max_length=500)
@@ -1,5 +1,6 @@
-from typing import List, Optional
-from pydantic import BaseModel
+import json
+from typing import Any, List, Optional
+from pydantic import BaseModel, field_validator
 
 
 
@@ -12,22 +13,41 @@ class CategoryTranslationSchema(BaseModel):
         orm_mode = True
 
 
+class CategoryTranslationPatchSchema(BaseModel):
+    title: Optional[str] = None
+    intro: Optional[str] = None
+
+
+def parse_references(value):
+    # Older clients send the list as a JSON string
+    if isinstance(value, str):
+        try:
+            return json.loads(value) if value.strip() else []
+        except ValueError:
+            raise ValueError("references_json must be a list or a JSON list")
+    return value
+
+
 class CategoryCreateSchema(BaseModel):
     key: str
-    references_json: Optional[str] = None
+    references_json: Optional[List[Any]] = None
     translations: List[CategoryTranslationSchema]
 
+    _references = field_validator("references_json", mode="before")(parse_references)
+
 
 class CategoryUpdateSchema(BaseModel):
     key: Optional[str] = None
-    references_json: Optional[str] = None
+    references_json: Optional[List[Any]] = None
     translations: Optional[List[CategoryTranslationSchema]] = None
 
+    _references = field_validator("references_json", mode="before")(parse_references)
+
 
 class CategoryOutSchema(BaseModel):
     id: int
     key: str
-    references_json: Optional[str]
+    references_json: Optional[List[Any]]
     translations: List[CategoryTranslationSchema]
 
     class Config:
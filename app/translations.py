@@ -0,0 +1,55 @@
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+
+# --------------------
+# Translation rows, matched by language_code
+# --------------------
+# Admin edits usually touch one or two languages. Comparing against the stored
+# rows lets us UPDATE only what changed, INSERT new languages and DELETE the
+# dropped ones, so row ids stay stable and untouched rows are not rewritten.
+
+
+def sync_translations(
+    db: Session,
+    model,
+    parent_column,
+    incoming: dict,
+    fields: list,
+    delete_missing: bool = True,
+) -> dict:
+    """Bring the translations of several parents in line with incoming.
+
+    incoming maps parent id -> list of {"language_code", <fields>...}. Fields a
+    translation leaves out are not compared or written. With delete_missing,
+    stored languages absent from a parent's list are deleted.
+    Returns how many rows were inserted, updated and deleted.
+    """
+    if not incoming:
+        return {"inserted": 0, "updated": 0, "deleted": 0}
+
+    rows = db.query(
+        model.id, parent_column.label("parent_id"), model.language_code, *[getattr(model, f) for f in fields]
+    ).filter(parent_column.in_(incoming))
+    existing = {(row.parent_id, row.language_code): row for row in rows}
+
+    inserts, updates, keep = [], [], set()
+    for parent_id, translations in incoming.items():
+        for tr in translations:
+            values = {f: tr[f] for f in fields if f in tr}
+            row = existing.get((parent_id, tr["language_code"]))
+            if row is None:
+                inserts.append({parent_column.key: parent_id, "language_code": tr["language_code"], **values})
+                continue
+            keep.add(row.id)
+            if any(getattr(row, f) != value for f, value in values.items()):
+                updates.append({"id": row.id, **values})
+
+    deletes = [row.id for row in existing.values() if row.id not in keep] if delete_missing else []
+
+    if deletes:
+        db.execute(delete(model).where(model.id.in_(deletes)), execution_options={"synchronize_session": False})
+    if updates:
+        db.execute(update(model), updates)
+    if inserts:
+        db.execute(insert(model), inserts)
+    return {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes)}
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
+from app.catalog_cache import bump_catalog_version
 from app.models.admin import Product
 
 # Map your product keys to image paths
@@ -24,6 +25,7 @@ def update_images():
                 print(f"Updated {key} -> {path}")
             else:
                 print(f"Product with key '{key}' not found")
+        bump_catalog_version(db)
         db.commit()
     finally:
         db.close()
@@ -43,6 +45,7 @@ def update_images():
                 print(f"Updated {key} -> {path}")
             else:
                 print(f"Product with key '{key}' not found")
+        bump_catalog_version(db)
         db.commit()
     finally:
         db.close()
@@ -1,6 +1,8 @@
 import bcrypt
+from fastapi import HTTPException
 from jose import jwt
 from datetime import datetime, timedelta
+from typing import Optional
 import os
 
 def hash_password(password: str) -> str:
@@ -19,3 +21,44 @@ def create_access_token(data: dict):
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def like_escape(text: str) -> str:
+    """Escape LIKE wildcards so text matches literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains_pattern(text: str) -> str:
+    """ILIKE pattern that matches text anywhere, with LIKE wildcards escaped."""
+    return f"%{like_escape(text)}%"
+
+
+def pagination_headers(ids: list, limit, total=None) -> dict:
+    """X-Next-After-Id when the page is full, and X-Total-Count when counted."""
+    headers = {}
+    if limit is not None and len(ids) == limit:
+        headers["X-Next-After-Id"] = str(ids[-1])
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    return headers
+
+
+def parse_fieldset(value: Optional[str], allowed, param: str = "fields") -> Optional[tuple]:
+    """Names from a comma-separated fields=/include= parameter, sorted so equal sets share cache entries.
+
+    None when the parameter is absent (everything); 400 on names outside allowed.
+    """
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {param}: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}",
+        )
+    return tuple(sorted(names))
+
+
+def in_fieldset(fieldset: Optional[tuple], name: str) -> bool:
+    return fieldset is None or name in fieldset
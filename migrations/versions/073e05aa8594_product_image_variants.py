@@ -0,0 +1,35 @@
+"""Product image variants
+
+Revision ID: 073e05aa8594
+Revises: 0ed4bcc0bf12
+Create Date: 2026-10-18 09:03:58.822845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '073e05aa8594'
+down_revision: Union[str, Sequence[str], None] = '0ed4bcc0bf12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('image_width', sa.Integer(), nullable=True))
+    op.add_column('products', sa.Column('image_height', sa.Integer(), nullable=True))
+    op.add_column('products', sa.Column('image_placeholder', sa.Text(), nullable=True))
+    op.add_column('products', sa.Column('image_variants', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('products', 'image_variants')
+    op.drop_column('products', 'image_placeholder')
+    op.drop_column('products', 'image_height')
+    op.drop_column('products', 'image_width')
@@ -0,0 +1,45 @@
+"""Translation language indexes
+
+Revision ID: 0ed4bcc0bf12
+Revises: e36f46eae3bc
+Create Date: 2026-10-18 08:59:10.594002
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0ed4bcc0bf12'
+down_revision: Union[str, Sequence[str], None] = 'e36f46eae3bc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the first translation per language before enforcing uniqueness
+    op.execute("""
+        DELETE FROM product_translations a
+        USING product_translations b
+        WHERE a.product_id = b.product_id
+          AND a.language_code = b.language_code
+          AND a.id > b.id
+    """)
+    op.execute("""
+        DELETE FROM category_translations a
+        USING category_translations b
+        WHERE a.category_id = b.category_id
+          AND a.language_code = b.language_code
+          AND a.id > b.id
+    """)
+    op.create_index('ix_product_translations_product_language', 'product_translations', ['product_id', 'language_code'], unique=True)
+    op.create_index('ix_category_translations_category_language', 'category_translations', ['category_id', 'language_code'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_category_translations_category_language', table_name='category_translations')
+    op.drop_index('ix_product_translations_product_language', table_name='product_translations')
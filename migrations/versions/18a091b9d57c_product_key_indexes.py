@@ -0,0 +1,31 @@
+"""Product key indexes
+
+Revision ID: 18a091b9d57c
+Revises: 197bb5ec3ac0
+Create Date: 2026-10-18 09:08:39.631738
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '18a091b9d57c'
+down_revision: Union[str, Sequence[str], None] = '197bb5ec3ac0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # categories.key is already unique (categories_key_key)
+    op.create_index('ix_products_category_key', 'products', ['category_id', 'key'], unique=True)
+    op.create_index('ix_products_key', 'products', ['key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_key', table_name='products')
+    op.drop_index('ix_products_category_key', table_name='products')
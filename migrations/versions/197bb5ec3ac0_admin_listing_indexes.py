@@ -0,0 +1,37 @@
+"""Admin listing indexes
+
+Revision ID: 197bb5ec3ac0
+Revises: 073e05aa8594
+Create Date: 2026-10-18 09:05:23.224929
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '197bb5ec3ac0'
+down_revision: Union[str, Sequence[str], None] = '073e05aa8594'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_products_category_id_id', 'products', ['category_id', 'id'], unique=False)
+    op.create_index('ix_products_key_trgm', 'products', ['key'], unique=False, postgresql_using='gin', postgresql_ops={'key': 'gin_trgm_ops'})
+    op.create_index('ix_categories_key_trgm', 'categories', ['key'], unique=False, postgresql_using='gin', postgresql_ops={'key': 'gin_trgm_ops'})
+    op.create_index('ix_product_translations_title_trgm', 'product_translations', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_category_translations_title_trgm', 'category_translations', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_category_translations_title_trgm', table_name='category_translations')
+    op.drop_index('ix_product_translations_title_trgm', table_name='product_translations')
+    op.drop_index('ix_categories_key_trgm', table_name='categories')
+    op.drop_index('ix_products_key_trgm', table_name='products')
+    op.drop_index('ix_products_category_id_id', table_name='products')
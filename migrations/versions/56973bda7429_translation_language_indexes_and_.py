@@ -0,0 +1,39 @@
+"""Translation language indexes and required parents
+
+Revision ID: 56973bda7429
+Revises: 6885c16bc78e
+Create Date: 2026-10-18 09:18:58.054500
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '56973bda7429'
+down_revision: Union[str, Sequence[str], None] = '6885c16bc78e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Translations without a parent can never be served; drop them before requiring one
+    op.execute("DELETE FROM category_translations WHERE category_id IS NULL")
+    op.execute("DELETE FROM product_translations WHERE product_id IS NULL")
+    op.alter_column('category_translations', 'category_id', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('product_translations', 'product_id', existing_type=sa.Integer(), nullable=False)
+
+    # Per-language scans (whole catalog in one language) start from language_code
+    op.create_index('ix_category_translations_language_category', 'category_translations', ['language_code', 'category_id'], unique=False)
+    op.create_index('ix_product_translations_language_product', 'product_translations', ['language_code', 'product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_translations_language_product', table_name='product_translations')
+    op.drop_index('ix_category_translations_language_category', table_name='category_translations')
+    op.alter_column('product_translations', 'product_id', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('category_translations', 'category_id', existing_type=sa.Integer(), nullable=True)
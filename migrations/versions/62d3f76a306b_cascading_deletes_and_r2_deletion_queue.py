@@ -0,0 +1,52 @@
+"""Cascading deletes and R2 deletion queue
+
+Revision ID: 62d3f76a306b
+Revises: ff9b9412fe77
+Create Date: 2026-10-18 09:16:05.498647
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '62d3f76a306b'
+down_revision: Union[str, Sequence[str], None] = 'ff9b9412fe77'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FOREIGN_KEYS = [
+    # (constraint, table, column, referenced table)
+    ('products_category_id_fkey', 'products', 'category_id', 'categories'),
+    ('category_translations_category_id_fkey', 'category_translations', 'category_id', 'categories'),
+    ('product_translations_product_id_fkey', 'product_translations', 'product_id', 'products'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Let Postgres remove children, so deleting a category is one statement
+    for name, table, column, referenced in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referenced, [column], ['id'], ondelete='CASCADE')
+
+    op.create_table(
+        'r2_deletions',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('image_url', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('key'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('r2_deletions')
+    for name, table, column, referenced in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referenced, [column], ['id'])
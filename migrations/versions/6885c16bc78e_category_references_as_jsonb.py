@@ -0,0 +1,69 @@
+"""Category references as JSONB
+
+Revision ID: 6885c16bc78e
+Revises: 62d3f76a306b
+Create Date: 2026-10-18 09:17:25.362476
+
+"""
+from typing import Sequence, Union
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6885c16bc78e'
+down_revision: Union[str, Sequence[str], None] = '62d3f76a306b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _parse_references(text):
+    """Stored text may be empty, invalid, or a JSON list encoded twice."""
+    value = text
+    try:
+        while isinstance(value, str):
+            value = json.loads(value) if value.strip() else []
+    except ValueError:
+        print(f"⚠️ Unreadable references replaced with []: {text!r}")
+        return []
+    return value if isinstance(value, list) else []
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('categories', sa.Column('references_jsonb', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+    categories = sa.table(
+        'categories',
+        sa.column('id', sa.Integer),
+        sa.column('references_json', sa.Text),
+        sa.column('references_jsonb', postgresql.JSONB),
+    )
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(categories.c.id, categories.c.references_json)
+        .where(categories.c.references_json.isnot(None))
+    ).all()
+    if rows:
+        conn.execute(
+            categories.update()
+            .where(categories.c.id == sa.bindparam('category_id'))
+            .values(references_jsonb=sa.bindparam('references')),
+            [{'category_id': row.id, 'references': _parse_references(row.references_json)} for row in rows],
+        )
+
+    op.drop_column('categories', 'references_json')
+    op.alter_column('categories', 'references_jsonb', new_column_name='references_json')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'categories', 'references_json',
+        type_=sa.Text(),
+        postgresql_using='references_json::text',
+    )
@@ -0,0 +1,39 @@
+"""Unique product keys
+
+Revision ID: 766f24635e8d
+Revises: 7cad0c6edfc7
+Create Date: 2026-10-18 09:43:32.198748
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '766f24635e8d'
+down_revision: Union[str, Sequence[str], None] = '7cad0c6edfc7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Public item URLs and key allocation address products by key alone, so it
+    # must be unique across categories. Later duplicates get their id appended.
+    op.execute("""
+        UPDATE products SET key = products.key || '-' || products.id
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY key ORDER BY id) AS n FROM products
+        ) AS ranked
+        WHERE ranked.id = products.id AND ranked.n > 1
+    """)
+    op.drop_index('ix_products_key', table_name='products')
+    op.create_index('ix_products_key', 'products', ['key'], unique=True, postgresql_ops={'key': 'text_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_key', table_name='products')
+    op.create_index('ix_products_key', 'products', ['key'], unique=False, postgresql_ops={'key': 'text_pattern_ops'})
@@ -0,0 +1,56 @@
+"""Full-text search vectors
+
+Revision ID: 7cad0c6edfc7
+Revises: a854085bfded
+Create Date: 2026-10-18 09:25:43.392951
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7cad0c6edfc7'
+down_revision: Union[str, Sequence[str], None] = 'a854085bfded'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CONFIG = (
+    "CASE language_code "
+    "WHEN 'en' THEN 'english'::regconfig WHEN 'fr' THEN 'french'::regconfig "
+    "WHEN 'nl' THEN 'dutch'::regconfig WHEN 'pt' THEN 'portuguese'::regconfig "
+    "WHEN 'ar' THEN 'arabic'::regconfig WHEN 'de' THEN 'german'::regconfig "
+    "WHEN 'es' THEN 'spanish'::regconfig ELSE 'simple'::regconfig END"
+)
+
+
+def search_vector(title: str, body: str) -> str:
+    return (
+        f"setweight(to_tsvector({CONFIG}, coalesce({title}, '')), 'A') || "
+        f"setweight(to_tsvector({CONFIG}, coalesce({body}, '')), 'B')"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored generated columns: adding one rewrites the table once
+    op.add_column('category_translations', sa.Column(
+        'search_vector', postgresql.TSVECTOR(), sa.Computed(search_vector('title', 'intro'), persisted=True)
+    ))
+    op.add_column('product_translations', sa.Column(
+        'search_vector', postgresql.TSVECTOR(), sa.Computed(search_vector('title', 'description'), persisted=True)
+    ))
+    op.create_index('ix_category_translations_search_vector', 'category_translations', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_product_translations_search_vector', 'product_translations', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_translations_search_vector', table_name='product_translations', postgresql_using='gin')
+    op.drop_index('ix_category_translations_search_vector', table_name='category_translations', postgresql_using='gin')
+    op.drop_column('product_translations', 'search_vector')
+    op.drop_column('category_translations', 'search_vector')
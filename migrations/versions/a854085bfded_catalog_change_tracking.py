@@ -0,0 +1,105 @@
+"""Catalog change tracking
+
+Revision ID: a854085bfded
+Revises: 56973bda7429
+Create Date: 2026-10-18 09:20:33.369080
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a854085bfded'
+down_revision: Union[str, Sequence[str], None] = '56973bda7429'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ['categories', 'category_translations', 'products', 'product_translations']
+
+STAMP_VERSION = """
+CREATE OR REPLACE FUNCTION catalog_stamp_version() RETURNS trigger AS $$
+BEGIN
+    NEW.version := pg_current_xact_id()::text::bigint;
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+RECORD_TOMBSTONE = """
+CREATE OR REPLACE FUNCTION catalog_record_tombstone() RETURNS trigger AS $$
+DECLARE
+    old_row jsonb := to_jsonb(OLD);
+BEGIN
+    EXECUTE format(
+        'INSERT INTO %I.catalog_tombstones (table_name, row_id, parent_id, language_code, version, deleted_at) '
+        'VALUES ($1, $2, $3, $4, pg_current_xact_id()::text::bigint, now())',
+        TG_TABLE_SCHEMA
+    ) USING
+        TG_TABLE_NAME,
+        OLD.id,
+        COALESCE(old_row->>'category_id', old_row->>'product_id')::integer,
+        old_row->>'language_code';
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+        op.add_column(table, sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+
+    op.create_index('ix_categories_version', 'categories', ['version'], unique=False)
+    op.create_index('ix_products_version', 'products', ['version'], unique=False)
+    op.create_index('ix_category_translations_language_version', 'category_translations', ['language_code', 'version'], unique=False)
+    op.create_index('ix_product_translations_language_version', 'product_translations', ['language_code', 'version'], unique=False)
+
+    op.create_table('catalog_tombstones',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('language_code', sa.String(), nullable=True),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_catalog_tombstones_table_version', 'catalog_tombstones', ['table_name', 'version'], unique=False)
+
+    op.execute(STAMP_VERSION)
+    op.execute(RECORD_TOMBSTONE)
+    for table in TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_stamp_version BEFORE INSERT OR UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION catalog_stamp_version()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_record_tombstone AFTER DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION catalog_record_tombstone()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_record_tombstone ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_stamp_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS catalog_record_tombstone()")
+    op.execute("DROP FUNCTION IF EXISTS catalog_stamp_version()")
+
+    op.drop_index('ix_catalog_tombstones_table_version', table_name='catalog_tombstones')
+    op.drop_table('catalog_tombstones')
+    op.drop_index('ix_product_translations_language_version', table_name='product_translations')
+    op.drop_index('ix_category_translations_language_version', table_name='category_translations')
+    op.drop_index('ix_products_version', table_name='products')
+    op.drop_index('ix_categories_version', table_name='categories')
+    for table in TABLES:
+        op.drop_column(table, 'version')
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,31 @@
+"""Product key prefix index
+
+Revision ID: ff9b9412fe77
+Revises: 18a091b9d57c
+Create Date: 2026-10-18 09:14:56.237603
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ff9b9412fe77'
+down_revision: Union[str, Sequence[str], None] = '18a091b9d57c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # text_pattern_ops serves key = ... and key LIKE 'base-%' whatever the collation
+    op.drop_index('ix_products_key', table_name='products')
+    op.create_index('ix_products_key', 'products', ['key'], unique=False, postgresql_ops={'key': 'text_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_key', table_name='products')
+    op.create_index('ix_products_key', 'products', ['key'], unique=False)
@@ -0,0 +1,88 @@
+"""Fixtures for the tests that run against Postgres.
+
+They need TEST_DATABASE_URL, a scratch database (never production), and are
+skipped without it:
+
+    TEST_DATABASE_URL=postgresql://localhost/elegant_test pytest
+
+The app builds its engine from DATABASE_URL on import and routes open their
+own sessions, so DATABASE_URL is pointed at APP_SCHEMA here, before any test
+module imports app. Each suite's schema is dropped when the session ends.
+"""
+import os
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+APP_SCHEMA = "test_app"
+BUDGET_CATEGORIES = 4
+BUDGET_PRODUCTS = 5  # per category
+
+if TEST_DATABASE_URL:
+    # public stays on the search_path for extensions. The version poll is
+    # turned off so every request pays for it, as it would after a write.
+    _url = make_url(TEST_DATABASE_URL).update_query_dict({"options": f"-csearch_path={APP_SCHEMA},public"})
+    os.environ["DATABASE_URL"] = _url.render_as_string(hide_password=False)
+    os.environ["CATALOG_VERSION_POLL_SECONDS"] = "0"
+
+
+@pytest.fixture(scope="session")
+def database_url():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture(scope="session")
+def scratch_schema(database_url):
+    """Create a schema on the test database for the duration of a suite, then drop it."""
+    created = []
+
+    def create(name: str):
+        with create_engine(database_url).begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {name} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {name}"))
+        created.append(name)
+        return name
+
+    yield create
+    with create_engine(database_url).begin() as conn:
+        for name in created:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {name} CASCADE"))
+
+
+@pytest.fixture(scope="session")
+def app(scratch_schema):
+    scratch_schema(APP_SCHEMA)
+    from app.database import Base, engine
+    import app.models  # noqa: F401  registers the tables on Base
+
+    # create_all on the search_path would find tables in public and skip them,
+    # so they are created in APP_SCHEMA explicitly before the app starts
+    Base.metadata.create_all(engine.execution_options(schema_translate_map={None: APP_SCHEMA}))
+    from app.main import app
+
+    yield app
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def catalog(app):
+    """(category_ids, product_ids) of BUDGET_CATEGORIES × BUDGET_PRODUCTS seeded products, every language."""
+    from app.benchmarks.seed import seed_catalog
+    from app.database import engine
+
+    with engine.begin() as conn:
+        found = conn.execute(text("SELECT relnamespace::regnamespace::text FROM pg_class WHERE oid = 'categories'::regclass"))
+        assert found.scalar() == APP_SCHEMA, f"the app's connections do not resolve tables in {APP_SCHEMA}"
+        category_ids, product_ids = seed_catalog(conn, BUDGET_CATEGORIES, BUDGET_PRODUCTS)
+        conn.execute(text("ANALYZE"))
+    return category_ids, product_ids
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    from fastapi.testclient import TestClient
+
+    return TestClient(app)
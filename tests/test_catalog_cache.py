@@ -0,0 +1,22 @@
+"""Public catalog snapshots for browser Accept-Language chains."""
+from app.api import get_data_from_database
+
+# Not a configured chain: pt falls back to en alone, this asks for es first
+BROWSER_ACCEPT_LANGUAGE = "pt-BR,pt;q=0.9,es;q=0.8,en-US;q=0.7,en;q=0.6,fr;q=0.5"
+
+
+def test_browser_chain_is_built_once_and_compressed(catalog, client, monkeypatch):
+    builds = []
+    build_catalog = get_data_from_database.build_catalog
+
+    def counting_build(db, languages, *fieldset):
+        builds.append(languages)
+        return build_catalog(db, languages, *fieldset)
+
+    monkeypatch.setattr(get_data_from_database, "build_catalog", counting_build)
+    headers = {"Accept-Language": BROWSER_ACCEPT_LANGUAGE, "Accept-Encoding": "br"}
+    responses = [client.get("/api/products/pt", headers=headers) for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert all(response.headers.get("content-encoding") == "br" for response in responses)
+    assert builds == [["pt", "es", "en"]]
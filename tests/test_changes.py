@@ -0,0 +1,130 @@
+"""build_changes and the change-tracking triggers (CHANGE_TRACKING_FUNCTIONS in app/models/admin.py).
+
+Each test takes the version of a first call as its since, writes through a
+connection of its own, and checks what the next call reports. The catalog is
+seeded into its own schema, so the app's schema and the route budgets are
+left alone.
+"""
+import pytest
+from sqlalchemy import create_engine, delete, select, update
+from sqlalchemy.orm import Session
+from app.api.get_data_from_database import build_changes
+from app.benchmarks.seed import seed_catalog
+from app.database import Base
+from app.models.admin import Category, Product, ProductTranslation
+
+SCHEMA = "test_changes"
+LANGUAGES = ["en"]
+
+
+@pytest.fixture(scope="module")
+def engine(database_url, scratch_schema):
+    engine = create_engine(database_url).execution_options(schema_translate_map={None: scratch_schema(SCHEMA)})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def seeded(engine):
+    """(category_ids, product_ids) of a fresh 3 × 3 catalog; the tests delete from it."""
+    with engine.begin() as conn:
+        # The tombstones this leaves are older than any test's since
+        conn.execute(delete(Category))
+        return seed_catalog(conn, 3, 3, ["en", "fr"])
+
+
+def changes(engine, since: int) -> dict:
+    with Session(engine) as db:
+        return build_changes(db, LANGUAGES, since)
+
+
+def current_version(engine) -> int:
+    return changes(engine, 0)["version"]
+
+
+def changed_ids(result: dict, kind: str) -> set:
+    return {row["id"] for row in result[kind]}
+
+
+def test_updated_rows_appear(engine, seeded):
+    _, product_ids = seeded
+    since = current_version(engine)
+    with engine.begin() as conn:
+        conn.execute(update(Product).where(Product.id == product_ids[0]).values(image_url="/static/products/new.png"))
+        conn.execute(update(ProductTranslation).where(
+            ProductTranslation.product_id == product_ids[1], ProductTranslation.language_code == "en",
+        ).values(title="Retitled"))
+
+    result = changes(engine, since)
+    assert changed_ids(result, "products") == {product_ids[0], product_ids[1]}
+    assert changed_ids(result, "categories") == set()
+    assert result["deleted"] == {"categories": [], "products": []}
+
+
+def test_untracked_language_is_not_a_change(engine, seeded):
+    _, product_ids = seeded
+    since = current_version(engine)
+    with engine.begin() as conn:
+        conn.execute(update(ProductTranslation).where(
+            ProductTranslation.product_id == product_ids[0], ProductTranslation.language_code == "fr",
+        ).values(title="Retitré"))
+
+    assert changed_ids(changes(engine, since), "products") == set()
+
+
+def test_deleted_product_is_a_tombstone(engine, seeded):
+    _, product_ids = seeded
+    since = current_version(engine)
+    with engine.begin() as conn:
+        conn.execute(delete(Product).where(Product.id == product_ids[0]))
+
+    result = changes(engine, since)
+    assert result["deleted"]["products"] == [product_ids[0]]
+    assert changed_ids(result, "products") == set()
+
+
+def test_deleted_translation_drops_the_product(engine, seeded):
+    _, product_ids = seeded
+    since = current_version(engine)
+    with engine.begin() as conn:
+        conn.execute(delete(ProductTranslation).where(
+            ProductTranslation.product_id == product_ids[0], ProductTranslation.language_code == "en",
+        ))
+
+    # Its fr translation is left, but nothing in the en chain
+    assert changes(engine, since)["deleted"]["products"] == [product_ids[0]]
+
+
+def test_category_delete_cascades_to_tombstones(engine, seeded):
+    category_ids, _ = seeded
+    with engine.connect() as conn:
+        cascaded = set(conn.scalars(select(Product.id).where(Product.category_id == category_ids[0])))
+    assert cascaded
+
+    since = current_version(engine)
+    with engine.begin() as conn:
+        conn.execute(delete(Category).where(Category.id == category_ids[0]))
+
+    result = changes(engine, since)
+    assert result["deleted"]["categories"] == [category_ids[0]]
+    assert set(result["deleted"]["products"]) == cascaded
+
+
+def test_version_does_not_skip_a_late_commit(engine, seeded):
+    _, product_ids = seeded
+    since = current_version(engine)
+
+    # Writes before the next call is made, but commits only after it
+    with engine.connect() as late:
+        late.begin()
+        late.execute(update(Product).where(Product.id == product_ids[0]).values(image_url="/static/products/late.png"))
+
+        with engine.begin() as conn:
+            conn.execute(update(Product).where(Product.id == product_ids[1]).values(image_url="/static/products/early.png"))
+        first = changes(engine, since)
+        assert changed_ids(first, "products") == {product_ids[1]}
+        late.commit()
+
+    second = changes(engine, first["version"])
+    assert product_ids[0] in changed_ids(second, "products")
@@ -0,0 +1,23 @@
+"""fields= and include= on the public catalog endpoints."""
+
+
+def test_empty_include_drops_products(catalog, client):
+    response = client.get("/api/products/en?include=")
+    assert response.status_code == 200
+    categories = response.json()["categories"]
+    assert categories
+    assert all("products" not in category for category in categories)
+
+
+def test_fields_limit_attributes(catalog, client):
+    categories = client.get("/api/products/en?fields=title").json()["categories"]
+    assert {key for category in categories for key in category} <= {"id", "key", "title", "products"}
+    products = [product for category in categories for product in category["products"]]
+    assert products
+    assert all(set(product) <= {"id", "key", "title"} for product in products)
+
+
+def test_default_catalog_has_everything(catalog, client):
+    categories = client.get("/api/products/en").json()["categories"]
+    assert all("products" in category and "intro" in category for category in categories)
+    assert all("description" in product for category in categories for product in category["products"])
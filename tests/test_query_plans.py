@@ -0,0 +1,110 @@
+"""The routers' hot queries are served by the indexes meant for them.
+
+A synthetic catalog is seeded into its own schema and each query is built
+with the same helpers the routes use, then EXPLAINed with enable_seqscan=off.
+That setting alone would pass any query that has some index to fall back on
+(often a full primary key scan), so each case names the indexes its plan must
+use; a tuple means any one of them will do.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from app.api.adminproducts import product_list_filters, product_list_query, taken_keys_query
+from app.api.categorymanager import category_list_filters, category_tree_query
+from app.api.get_data_from_database import _category_query, _product_query, category_search_query, product_search_query
+from app.benchmarks.seed import seed_catalog
+from app.database import Base
+from app.models.admin import Category, Product
+
+SCHEMA = "test_query_plans"
+PLAN_CATEGORIES = 200
+PLAN_PRODUCTS = 10  # per category
+
+CATEGORY_LANGUAGE = ("ix_category_translations_language_category", "ix_category_translations_language_version")
+PRODUCT_LANGUAGE = ("ix_product_translations_language_product", "ix_product_translations_language_version")
+PRODUCTS_OF_CATEGORY = ("ix_products_category_id_id", "ix_products_category_key")
+CATEGORY_TREE = ["ix_categories_id", "ix_category_translations_category_language", PRODUCTS_OF_CATEGORY]
+
+# (label, query from (db, category_id, product_id, category_key, product_key), indexes, needs pg_trgm)
+HOT_QUERIES = [
+    ("public catalog: categories", lambda db, c, p, ck, pk: _category_query(db, ["en"]), [CATEGORY_LANGUAGE], False),
+    ("public catalog: products", lambda db, c, p, ck, pk: _product_query(db, ["en"]), [PRODUCT_LANGUAGE], False),
+    ("public category: by key", lambda db, c, p, ck, pk: _category_query(db, ["en"]).filter(Category.key == ck),
+     ["categories_key_key"], False),
+    ("public category: products", lambda db, c, p, ck, pk: _product_query(db, ["en"]).filter(Product.category_id == c),
+     [PRODUCTS_OF_CATEGORY], False),
+    ("public item: by key", lambda db, c, p, ck, pk: _product_query(db, ["en"]).filter(Product.key == pk),
+     ["ix_products_key"], False),
+    ("public search: products", lambda db, c, p, ck, pk: product_search_query("en", f"product {p}").limit(20),
+     ["ix_product_translations_search_vector"], False),
+    # Categories are few, so the planner may narrow by language before @@ instead
+    ("public search: categories", lambda db, c, p, ck, pk: category_search_query("fr", f"category {c}").limit(5),
+     [("ix_category_translations_search_vector",) + CATEGORY_LANGUAGE], False),
+    ("admin products: page",
+     lambda db, c, p, ck, pk: product_list_query(db, "en", product_list_filters()).filter(Product.id > p).limit(50),
+     ["ix_products_id"], False),
+    ("admin products: category",
+     lambda db, c, p, ck, pk: product_list_query(db, "en", product_list_filters(category_id=c)).limit(50),
+     [PRODUCTS_OF_CATEGORY], False),
+    ("admin products: search",
+     lambda db, c, p, ck, pk: product_list_query(db, "en", product_list_filters(q="product 12")).limit(50),
+     ["ix_products_key_trgm", "ix_product_translations_title_trgm"], True),
+    ("admin category tree: one", lambda db, c, p, ck, pk: category_tree_query().where(Category.id == c),
+     CATEGORY_TREE, False),
+    ("admin category tree: page", lambda db, c, p, ck, pk: category_tree_query().where(Category.id > c).limit(20),
+     CATEGORY_TREE, False),
+    ("admin categories: search",
+     lambda db, c, p, ck, pk: category_tree_query().where(*category_list_filters(q="category 3")).limit(20),
+     ["ix_category_translations_title_trgm"], True),
+    ("product key allocation", lambda db, c, p, ck, pk: taken_keys_query(db, [pk]), ["ix_products_key"], False),
+]
+
+
+@pytest.fixture(scope="module")
+def plan_db(database_url, scratch_schema):
+    """(db, category_id, product_id, category_key, product_key) on a seeded schema, seqscans off."""
+    engine = create_engine(database_url).execution_options(schema_translate_map={None: SCHEMA})
+    scratch_schema(SCHEMA)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        category_ids, product_ids = seed_catalog(conn, PLAN_CATEGORIES, PLAN_PRODUCTS)
+        conn.execute(text("ANALYZE"))
+
+    with Session(engine) as db:
+        # EXPLAIN goes through text(), which schema_translate_map does not rewrite
+        db.execute(text(f"SET LOCAL search_path TO {SCHEMA}, public"))
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        category_id = category_ids[len(category_ids) // 2]
+        product_id = product_ids[len(product_ids) // 2]
+        category_key = db.query(Category.key).filter(Category.id == category_id).scalar()
+        product_key = db.query(Product.key).filter(Product.id == product_id).scalar()
+        yield db, category_id, product_id, category_key, product_key
+    engine.dispose()
+
+
+def plan_nodes(plan: dict) -> list:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes += plan_nodes(child)
+    return nodes
+
+
+@pytest.mark.parametrize(
+    "label, build, indexes, needs_trgm", HOT_QUERIES, ids=[label for label, _, _, _ in HOT_QUERIES]
+)
+def test_query_uses_its_index(plan_db, label, build, indexes, needs_trgm):
+    db = plan_db[0]
+    if needs_trgm and not db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).scalar():
+        pytest.skip("pg_trgm is not installed")
+
+    query = build(*plan_db)
+    statement = getattr(query, "statement", query)
+    sql = str(statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}))
+    nodes = plan_nodes(db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"])
+
+    seq_scans = [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+    assert not seq_scans, f"Seq Scan on {', '.join(seq_scans)}"
+    used = {node["Index Name"] for node in nodes if "Index Name" in node}
+    for expected in indexes:
+        choices = expected if isinstance(expected, tuple) else (expected,)
+        assert used.intersection(choices), f"expected {' or '.join(choices)}, plan uses {sorted(used)}"
@@ -0,0 +1,153 @@
+"""Every route in app/api stays within its @query_budget (app/query_budgets.py).
+
+Each route gets one representative request against the seeded catalog; the
+SQL statements it executes and the rows they return or touch are counted,
+background tasks included. The cases run in order and writes come last.
+
+Routes that must not reach an outside service (uploads to R2, the contact
+mailer) are sent a request their validation rejects, so the suite stays
+offline and their budget of 0 still holds.
+"""
+import json
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+
+
+def _translation(lang, title):
+    return {"language_code": lang, "title": title, "description": f"{title} description"}
+
+
+# (method, route path, expected status, request kwargs from (category_ids, product_ids, client))
+ROUTE_REQUESTS = [
+    ("GET", "/api/products/{language_code}", 200, lambda c, p, client: {"url": "/api/products/en"}),
+    ("GET", "/api/products/{language_code}/categories/{category_key}", 200,
+     lambda c, p, client: {"url": "/api/products/en/categories/bench-category-0"}),
+    ("GET", "/api/products/{language_code}/items/{product_key}", 200,
+     lambda c, p, client: {"url": f"/api/products/en/items/bench-product-{c[0]}-0"}),
+    ("GET", "/api/products/{language_code}/changes", 200, lambda c, p, client: {"url": "/api/products/en/changes?since=0"}),
+    ("GET", "/api/products/{language_code}/search", 200, lambda c, p, client: {"url": "/api/products/en/search?q=product"}),
+
+    ("GET", "/api/admin/products/by-lang/{lang}", 200,
+     lambda c, p, client: {"url": "/api/admin/products/by-lang/en?limit=10"}),
+    ("POST", "/api/admin/products/image-uploads", 400, lambda c, p, client: {
+        "url": "/api/admin/products/image-uploads",
+        "json": {"filename": "notes.txt", "content_type": "text/plain", "size": 10},
+    }),
+    ("POST", "/api/admin/products/image-uploads/complete", 400, lambda c, p, client: {
+        "url": "/api/admin/products/image-uploads/complete",
+        "json": {"key": "elsewhere/image.png", "upload_id": "-", "parts": []},
+    }),
+    ("POST", "/api/admin/products/", 200, lambda c, p, client: {
+        "url": "/api/admin/products/",
+        "data": {"category_id": c[0], "translations": json.dumps([_translation("en", "Budget product")])},
+    }),
+    ("POST", "/api/admin/products/batch", 200, lambda c, p, client: {
+        "url": "/api/admin/products/batch",
+        "json": {"items": [
+            {"category_id": c[0], "translations": [_translation("en", f"Batch product {i}")]} for i in range(3)
+        ] + [
+            {"id": p[3], "category_id": c[0], "translations": [_translation("en", "Batch update")]},
+        ]},
+    }),
+    ("PUT", "/api/admin/products/{product_id}", 200, lambda c, p, client: {
+        "url": f"/api/admin/products/{p[1]}",
+        "data": {
+            "category_id": c[0],
+            "translations": json.dumps([_translation("en", "Updated"), _translation("fr", "Mis à jour")]),
+        },
+    }),
+    ("PATCH", "/api/admin/products/{product_id}/translations/{language_code}", 200, lambda c, p, client: {
+        "url": f"/api/admin/products/{p[1]}/translations/de",
+        "json": {"title": "Aktualisiert"},
+    }),
+    ("DELETE", "/api/admin/products/{product_id}", 200, lambda c, p, client: {"url": f"/api/admin/products/{p[2]}"}),
+
+    ("GET", "/api/admin/categories/", 200, lambda c, p, client: {"url": "/api/admin/categories/?limit=10"}),
+    ("GET", "/api/admin/categories/{category_id}/products", 200,
+     lambda c, p, client: {"url": f"/api/admin/categories/{c[0]}/products"}),
+    ("POST", "/api/admin/categories/", 200, lambda c, p, client: {
+        "url": "/api/admin/categories/",
+        "json": {"key": "budget-category", "translations": [{"language_code": "en", "title": "Budget"}]},
+    }),
+    ("PUT", "/api/admin/categories/{category_id}", 200, lambda c, p, client: {
+        "url": f"/api/admin/categories/{c[1]}",
+        "json": {"translations": [{"language_code": "en", "title": "Updated"}]},
+    }),
+    ("PATCH", "/api/admin/categories/{category_id}/translations/{language_code}", 200, lambda c, p, client: {
+        "url": f"/api/admin/categories/{c[1]}/translations/fr",
+        "json": {"title": "Mis à jour"},
+    }),
+    ("DELETE", "/api/admin/categories/{category_id}", 200, lambda c, p, client: {"url": f"/api/admin/categories/{c[-1]}"}),
+
+    ("GET", "/api/admin/catalog/export", 200, lambda c, p, client: {"url": "/api/admin/catalog/export"}),
+    ("POST", "/api/admin/catalog/import", 200, lambda c, p, client: {
+        "url": "/api/admin/catalog/import",
+        "files": [("files", ("catalog.ndjson", client.get("/api/admin/catalog/export").content, "application/x-ndjson"))],
+        "data": {"dry_run": "true"},
+    }),
+
+    ("POST", "/api/contact", 422, lambda c, p, client: {"url": "/api/contact", "json": {}}),
+    ("POST", "/api/admin/signup", 200, lambda c, p, client: {
+        "url": "/api/admin/signup",
+        "json": {"name": "Budget", "email": "budget@example.com", "password": "budget-password"},
+    }),
+    ("POST", "/api/admin/login", 200, lambda c, p, client: {
+        "url": "/api/admin/login",
+        "json": {"email": "budget@example.com", "password": "budget-password"},
+    }),
+    ("POST", "/api/admin/logout", 200, lambda c, p, client: {"url": "/api/admin/logout"}),
+]
+
+
+def api_routes(app) -> dict:
+    from fastapi.routing import APIRoute
+
+    return {
+        (method, route.path): route
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.endpoint.__module__.startswith("app.api.")
+        for method in route.methods
+    }
+
+
+@contextmanager
+def counting_sql():
+    """Count statements and the rows they return or touch (rowcount) on the app's engine."""
+    from app.database import engine
+
+    used = {"statements": 0, "rows": 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        used["statements"] += 1
+        used["rows"] += max(cursor.rowcount, 0)
+
+    event.listen(engine, "after_cursor_execute", count)
+    try:
+        yield used
+    finally:
+        event.remove(engine, "after_cursor_execute", count)
+
+
+def test_every_route_has_a_case(app):
+    assert set(api_routes(app)) == {(method, path) for method, path, _, _ in ROUTE_REQUESTS}
+
+
+@pytest.mark.parametrize(
+    "method, path, expected_status, request_kwargs",
+    ROUTE_REQUESTS,
+    ids=[f"{method} {path}" for method, path, _, _ in ROUTE_REQUESTS],
+)
+def test_route_within_budget(app, catalog, client, method, path, expected_status, request_kwargs):
+    route = api_routes(app).get((method, path))
+    assert route is not None, "no such route"
+    budget = getattr(route.endpoint, "query_budget", None)
+    assert budget is not None, "no @query_budget"
+
+    kwargs = request_kwargs(*catalog, client)
+    with counting_sql() as used:
+        response = client.request(method, **kwargs)
+
+    assert response.status_code == expected_status, response.text
+    assert used["statements"] <= budget.statements
+    assert used["rows"] <= budget.rows
@@ -0,0 +1,116 @@
+"""Concurrent admin writes: a slow image upload does not hold up the public
+catalog or a database connection, and racing creates still get distinct
+product keys.
+
+Product writes run their blocking R2 and SQLAlchemy work on blocking_executor
+(app/executor.py), so while one is in flight the event loop, and the
+threadpool serving the sync catalog routes, stay free.
+"""
+import json
+import threading
+import time
+import anyio
+import httpx
+import pytest
+
+UPLOAD_SECONDS = 2.0
+CATALOG_BOUND_SECONDS = 0.5
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_catalog_stays_fast_during_upload(app, catalog, monkeypatch):
+    from app.api import adminproducts
+    from app.database import engine
+
+    uploading = threading.Event()
+    connections_during_upload = []
+
+    def slow_upload(image):
+        # Nothing else is in flight yet, so any connection out is the create's
+        connections_during_upload.append(engine.pool.checkedout())
+        uploading.set()
+        time.sleep(UPLOAD_SECONDS)
+        return "https://cdn.test/products/slow.png"
+
+    monkeypatch.setattr(adminproducts, "upload_product_image", slow_upload)
+    monkeypatch.setattr(adminproducts, "generate_product_images", lambda product_id: None)
+
+    category_ids, _ = catalog
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        # Build the snapshot first, so what is timed below is serving it
+        assert (await client.get("/api/products/en")).status_code == 200
+
+        created = {}
+
+        async def create_product():
+            created["response"] = await client.post(
+                "/api/admin/products/",
+                data={
+                    "category_id": str(category_ids[0]),
+                    "translations": json.dumps([{"language_code": "en", "title": "Slow upload", "description": ""}]),
+                },
+                files={"image": ("slow.png", b"\x89PNG\r\n\x1a\n", "image/png")},
+            )
+
+        async with anyio.create_task_group() as tasks:
+            tasks.start_soon(create_product)
+            with anyio.fail_after(5):
+                while not uploading.is_set():
+                    await anyio.sleep(0.01)
+
+            start = time.perf_counter()
+            response = await client.get("/api/products/en")
+            elapsed = time.perf_counter() - start
+            assert response.status_code == 200
+            assert elapsed < CATALOG_BOUND_SECONDS
+            assert "response" not in created, "the upload finished before the catalog request was timed"
+
+    assert created["response"].status_code == 200, created["response"].text
+    assert connections_during_upload == [0], "the create held a database connection during the upload"
+
+
+@pytest.mark.anyio
+async def test_racing_creates_in_one_category_get_distinct_keys(app, catalog, monkeypatch):
+    from app.api import adminproducts
+
+    # Both requests allocate before either inserts, so both pick the same key
+    allocate = adminproducts.allocate_product_keys
+    both_allocated = threading.Barrier(2, timeout=5)
+    first_attempt = threading.local()
+
+    def racing_allocate(db, base_keys):
+        keys = allocate(db, base_keys)
+        if not getattr(first_attempt, "done", False):
+            first_attempt.done = True
+            both_allocated.wait()
+        return keys
+
+    monkeypatch.setattr(adminproducts, "allocate_product_keys", racing_allocate)
+
+    category_ids, _ = catalog
+    responses = []
+
+    async def create_product():
+        responses.append(await client.post(
+            "/api/admin/products/",
+            data={
+                "category_id": str(category_ids[0]),
+                "translations": json.dumps([{"language_code": "en", "title": "Racing product", "description": ""}]),
+            },
+        ))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        with anyio.fail_after(10):
+            async with anyio.create_task_group() as tasks:
+                tasks.start_soon(create_product)
+                tasks.start_soon(create_product)
+
+    assert [response.status_code for response in responses] == [200, 200], [r.text for r in responses]
+    assert sorted(response.json()["key"] for response in responses) == ["racing-product", "racing-product-1"]
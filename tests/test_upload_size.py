@@ -0,0 +1,54 @@
+"""An image_key over MAX_IMAGE_SIZE is refused without losing an image a product still shows."""
+import json
+from sqlalchemy import insert, select
+from app.models.admin import Product, R2Deletion
+from app.r2_client import public_url
+
+SHARED_KEY = "products/shared-oversize.png"
+
+
+class FakeR2:
+    """head_object reports every object as size bytes; deletes are recorded, not made."""
+
+    def __init__(self, size):
+        self.size = size
+        self.deleted = []
+
+    def head_object(self, Bucket, Key):
+        return {"ContentLength": self.size}
+
+    def delete_object(self, Bucket, Key):
+        self.deleted.append(Key)
+
+    def delete_objects(self, Bucket, Delete):
+        self.deleted.extend(item["Key"] for item in Delete["Objects"])
+        return {}
+
+
+def test_oversize_key_in_use_is_kept(app, catalog, client, monkeypatch):
+    from app import r2_cleanup
+    from app.api import adminproducts
+    from app.database import engine
+
+    category_ids, _ = catalog
+    with engine.begin() as conn:
+        conn.execute(insert(Product).values(
+            key="shared-oversize", category_id=category_ids[0], image_url=public_url(SHARED_KEY),
+        ))
+
+    fake = FakeR2(size=adminproducts.MAX_IMAGE_SIZE + 1)
+    monkeypatch.setattr(adminproducts, "r2", fake)
+    monkeypatch.setattr(r2_cleanup, "r2", fake)
+
+    response = client.post("/api/admin/products/", data={
+        "category_id": str(category_ids[0]),
+        "translations": json.dumps([{"language_code": "en", "title": "Oversize", "description": ""}]),
+        "image_key": SHARED_KEY,
+    })
+    assert response.status_code == 413, response.text
+    assert fake.deleted == []
+
+    with engine.connect() as conn:
+        assert conn.execute(select(R2Deletion.key).where(R2Deletion.key == SHARED_KEY)).scalar() == SHARED_KEY
+    r2_cleanup.drain_r2_deletions()
+    assert SHARED_KEY not in fake.deleted
@@ -0,0 +1,37 @@
+"""Product images that can't be processed are recorded once, not retried on every update."""
+import json
+from sqlalchemy import insert, select
+from app.models.admin import Product
+
+EXTERNAL_IMAGE = "https://images.elsewhere.test/external.png"
+
+
+def test_unprocessable_image_is_not_regenerated(app, catalog, client, monkeypatch):
+    from app.api import adminproducts
+    from app.database import engine
+    from app.images import generate_product_images
+
+    category_ids, _ = catalog
+    with engine.begin() as conn:
+        product_id = conn.execute(
+            insert(Product).values(key="external-image", category_id=category_ids[0], image_url=EXTERNAL_IMAGE)
+            .returning(Product.id)
+        ).scalar_one()
+
+    generate_product_images(product_id)
+    with engine.connect() as conn:
+        assert conn.execute(select(Product.image_variants).where(Product.id == product_id)).scalar() == []
+
+    scheduled = []
+    monkeypatch.setattr(adminproducts, "generate_product_images", scheduled.append)
+    form = {
+        "category_id": str(category_ids[0]),
+        "translations": json.dumps([{"language_code": "en", "title": "External image", "description": ""}]),
+    }
+    assert client.put(f"/api/admin/products/{product_id}", data=form).status_code == 200
+    assert scheduled == []
+
+    # A new image gets another try
+    response = client.put(f"/api/admin/products/{product_id}", data={**form, "existingImage": "/static/products/0.png"})
+    assert response.status_code == 200
+    assert scheduled == [product_id]